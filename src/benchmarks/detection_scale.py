@@ -0,0 +1,91 @@
+# src/benchmarks/detection_scale.py
+# Latency/accuracy trade-off of running the face detector on downscaled frames.
+#
+# Usage: python src/benchmarks/detection_scale.py recording.avi --scales 1.0 0.5 0.33 0.25
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from benchmarks.harness import load_frames, write_results
+from core.face_tracking import detect_faces
+from core.models import DEFAULT_PREDICTOR_PATH, get_detector, get_predictor, registry
+from core.landmarks import EYES, shape_to_array
+
+
+def eye_landmarks(predictor, gray, face):
+    return shape_to_array(predictor(gray, face))[EYES].astype(np.float64)
+
+
+def run(frames, detector, predictor, scales):
+    # Full-resolution detection is the reference for landmark error
+    reference = []
+    for gray in frames:
+        faces = detect_faces(detector, gray, 1.0)
+        reference.append(eye_landmarks(predictor, gray, faces[0]) if faces else None)
+
+    results = []
+    for scale in scales:
+        durations = []
+        errors = []
+        misses = 0
+        for gray, expected in zip(frames, reference):
+            start = time.perf_counter()
+            faces = detect_faces(detector, gray, scale)
+            durations.append(time.perf_counter() - start)
+            if expected is None:
+                continue
+            if not faces:
+                misses += 1
+                continue
+            points = eye_landmarks(predictor, gray, faces[0])
+            errors.append(np.mean(np.linalg.norm(points - expected, axis=1)))
+        results.append({
+            "scale": scale,
+            "mean_detection_ms": 1000 * float(np.mean(durations)),
+            "p95_detection_ms": 1000 * float(np.percentile(durations, 95)),
+            "mean_eye_landmark_error_px": float(np.mean(errors)) if errors else None,
+            "max_eye_landmark_error_px": float(np.max(errors)) if errors else None,
+            "missed_faces": misses,
+            "reference_faces": sum(expected is not None for expected in reference),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Face detection scale benchmark")
+    parser.add_argument("video", help="Recorded .avi session or .npz frame fixture to replay")
+    parser.add_argument("--predictor", default=DEFAULT_PREDICTOR_PATH)
+    parser.add_argument("--scales", type=float, nargs="+", default=[1.0, 0.5, 0.33, 0.25])
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--output", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    frames = [cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) for frame in load_frames(args.video, args.frames)]
+    if not frames:
+        sys.exit(f"No frames could be read from {args.video}")
+    detector = get_detector()
+    predictor = get_predictor(args.predictor)
+    results = run(frames, detector, predictor, args.scales)
+
+    height, width = frames[0].shape
+    print(f"{len(frames)} frames at {width}x{height}")
+    print(f"{'scale':>6} {'mean ms':>9} {'p95 ms':>9} {'speedup':>8} {'eye err px':>11} {'missed':>7}")
+    baseline = results[0]["mean_detection_ms"]
+    for result in results:
+        error = result["mean_eye_landmark_error_px"]
+        print(f"{result['scale']:>6.2f} {result['mean_detection_ms']:>9.2f} {result['p95_detection_ms']:>9.2f} "
+              f"{baseline / result['mean_detection_ms']:>7.1f}x {error if error is not None else float('nan'):>11.2f} "
+              f"{result['missed_faces']:>7}")
+
+    if args.output:
+        write_results(args.output, {"video": args.video, "width": width, "height": height, "results": results,
+                                     "model_load_seconds": registry.stats()["load_times"]})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# src/benchmarks/engagement_scoring.py
+# Whole-session engagement scoring: EngagementScorer sample by sample versus the vectorized score_session.
+#
+# Usage: python src/benchmarks/engagement_scoring.py --samples 1000000 --output data/benchmarks/engagement_scoring.json
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from benchmarks.harness import write_results
+from core.engagement_score import EngagementScorer, score_session
+from core.zones import ZONE_NAMES, ZONE_ROAD
+
+FPS = 30.0
+
+
+def synthetic_session(samples, seed=0):
+    """Road driving broken by glances; runs of 0.1-4 s so every duration threshold is crossed."""
+    rng = np.random.default_rng(seed)
+    zones = np.empty(samples, dtype=np.uint8)
+    codes = np.array([zone for zone in ZONE_NAMES if zone != ZONE_ROAD], dtype=np.uint8)
+    position = 0
+    road = True
+    while position < samples:
+        length = int(rng.uniform(1, 10) * FPS) if road else int(rng.uniform(0.1, 4) * FPS) + 1
+        zones[position:position + length] = ZONE_ROAD if road else rng.choice(codes)
+        position += length
+        road = not road
+    return np.arange(samples) / FPS, zones
+
+
+def score_streaming(timestamps, zones):
+    scorer = EngagementScorer()
+    for timestamp, zone in zip(timestamps.tolist(), zones.tolist()):
+        scorer.update(timestamp, zone)
+    return {"score": scorer.score(), "windows": scorer.window_summary(), "zone_dwell": scorer.zone_dwell()}
+
+
+def timed(function, *args, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def run(samples, repeat):
+    timestamps, zones = synthetic_session(samples)
+    streaming, streaming_s = timed(score_streaming, timestamps, zones, repeat=repeat)
+    vectorized, vectorized_s = timed(score_session, timestamps, zones, repeat=repeat)
+    if streaming != vectorized:
+        raise AssertionError(f"Scores differ:\n  streaming  {streaming}\n  vectorized {vectorized}")
+    return {
+        "samples": samples,
+        "hours": samples / FPS / 3600,
+        "result": vectorized,
+        "streaming_s": streaming_s,
+        "vectorized_s": vectorized_s,
+        "speedup": streaming_s / vectorized_s,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Engagement scoring benchmark")
+    parser.add_argument("--samples", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    results = run(args.samples, args.repeat)
+    print(f"{results['samples']} samples ({results['hours']:.1f} h at {FPS:.0f} FPS), score {results['result']['score']:.2f}%")
+    print(f"  streaming   {results['streaming_s']:8.3f}s")
+    print(f"  vectorized  {results['vectorized_s']:8.3f}s ({results['speedup']:.0f}x faster, identical results)")
+    if args.output:
+        write_results(args.output, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# src/benchmarks/gaze_pipeline.py
+# Reproducible benchmark of the gaze pipeline functions on recorded frames; no camera or display needed.
+#
+# Record a fixture once:  python src/benchmarks/gaze_pipeline.py --record recording.avi --calibration data/calibration.json
+# Run the suite:          python src/benchmarks/gaze_pipeline.py data/benchmarks/fixture.npz --output data/benchmarks/results.json
+import argparse
+import json
+import os
+import sys
+import time
+
+import cv2
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from benchmarks.harness import load_fixture_calibration, load_frames, measure, record_fixture, write_results
+from core.engagement_score import EngagementScorer, calculate_engagement_score
+from core.eye_tracking import EyeTracking
+from core.gaze_detection import EyeTracker
+from core.landmarks import LEFT_EYE, RIGHT_EYE, shape_to_array
+from core.models import DEFAULT_PREDICTOR_PATH, registry
+from core.zones import zone_code
+
+DEFAULT_FIXTURE = "data/benchmarks/fixture.npz"
+PREDICTION_WINDOW = 300  # Gaze directions per calculate_engagement_score call (10 s at 30 FPS)
+FIXTURE_FPS = 30.0  # Timestamps given to the streaming scorer's samples
+
+
+def prepare_samples(tracker, frames, calibration_data):
+    """Run detection and landmarks once so each function can be timed on its own inputs."""
+    samples = {"iris": [], "mapping": [], "screen": [], "fixed_points": [], "directions": [], "zones": []}
+    for frame in frames:
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        for face in tracker.detector(gray):
+            landmarks = shape_to_array(tracker.predictor(gray, face))
+            left_eye_region = tracker.get_eye_region(landmarks, LEFT_EYE)
+            right_eye_region = tracker.get_eye_region(landmarks, RIGHT_EYE)
+            samples["iris"].append((left_eye_region, frame, gray))
+            samples["iris"].append((right_eye_region, frame, gray))
+
+            gaze = tracker.estimate_gaze(frame, gray, landmarks)
+            if not gaze:
+                continue
+            left_iris_position, right_iris_position, screen_position = gaze
+            left_eye_center = tracker.midpoint(left_eye_region[0], left_eye_region[3])
+            right_eye_center = tracker.midpoint(right_eye_region[0], right_eye_region[3])
+            distance = tracker.calculate_eye_to_screen_distance(left_eye_center, right_eye_center, tracker.standard_distance_centers, tracker.standard_screen_distance)
+            iris_position = ((left_iris_position[0] + right_iris_position[0]) / 2, (left_iris_position[1] + right_iris_position[1]) / 2)
+            eye_center = ((left_eye_center[0] + right_eye_center[0]) / 2, (left_eye_center[1] + right_eye_center[1]) / 2)
+            samples["mapping"].append((iris_position, eye_center, distance))
+
+            screen_position_int = (int(screen_position[0]), int(screen_position[1]))
+            samples["screen"].append((calibration_data, screen_position_int))
+            samples["fixed_points"].append((calibration_data, screen_position_int))
+            zone = tracker.classify_gaze(calibration_data, screen_position_int)
+            samples["directions"].append(zone.lower().replace(' ', '_') if zone else 'off_road')
+            samples["zones"].append((len(samples["zones"]) / FIXTURE_FPS, zone_code(zone)))
+    return samples
+
+
+def prediction_windows(directions):
+    if not directions:
+        return []
+    repeated = (directions * (PREDICTION_WINDOW // len(directions) + 1))[:PREDICTION_WINDOW]
+    return [(repeated,)]
+
+
+def end_to_end(tracker, frames, calibration_data, repeat):
+    tracker.face_tracker.reset()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for frame in frames:
+            tracker.analyze_frame(frame, calibration_data)
+    elapsed = time.perf_counter() - start
+    calls = repeat * len(frames)
+    return {"calls": calls, "mean_us": elapsed / calls * 1e6, "ops_per_sec": calls / elapsed}
+
+
+def run_suite(fixture, predictor_path, calibration, repeat):
+    frames = load_frames(fixture)
+    tracker = EyeTracker(predictor_path, video_source=None)
+    calibration_data = tracker.apply_calibration(calibration)
+    samples = prepare_samples(tracker, frames, calibration_data)
+    eye_tracking = EyeTracking()
+
+    results = {
+        "get_iris_position": measure(tracker.get_iris_position, samples["iris"], repeat),
+        "map_to_screen": measure(tracker.map_to_screen, samples["mapping"], repeat),
+        "check_screen_position": measure(tracker.check_screen_position, samples["screen"], repeat),
+        "check_calibration_points": measure(tracker.check_calibration_points, samples["fixed_points"], repeat),
+        "EyeTracking.get_gaze_data": measure(eye_tracking.get_gaze_data, [(frame,) for frame in frames], repeat),
+        "calculate_engagement_score": measure(calculate_engagement_score, prediction_windows(samples["directions"]), repeat),
+        "EngagementScorer.update": measure(EngagementScorer().update, samples["zones"], repeat),
+        "end_to_end": end_to_end(tracker, frames, calibration_data, repeat),
+    }
+    height, width = frames[0].shape[:2]
+    return {"fixture": fixture, "frames": len(frames), "width": width, "height": height,
+            "repeat": repeat, "functions": results, "detection": tracker.detection_stats(),
+            "model_load_seconds": registry.stats()["load_times"]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gaze pipeline benchmark suite")
+    parser.add_argument("fixture", nargs="?", default=DEFAULT_FIXTURE, help="Frame fixture (.npz) or a short .avi")
+    parser.add_argument("--record", metavar="VIDEO", help="Record FIXTURE from this video instead of benchmarking")
+    parser.add_argument("--frames", type=int, default=120, help="Frames to store when recording a fixture")
+    parser.add_argument("--calibration", help="Calibration JSON (stored in the fixture when recording)")
+    parser.add_argument("--predictor", default=DEFAULT_PREDICTOR_PATH)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    if args.record:
+        count = record_fixture(args.record, args.fixture, args.frames, args.calibration)
+        print(f"Recorded {count} frames to {args.fixture}")
+        return
+
+    calibration = load_fixture_calibration(args.fixture)
+    if args.calibration:
+        with open(args.calibration) as f:
+            calibration = json.load(f)
+    if calibration is None:
+        sys.exit("A calibration is required: record it into the fixture or pass --calibration")
+
+    results = run_suite(args.fixture, args.predictor, calibration, args.repeat)
+    print(f"{results['frames']} frames at {results['width']}x{results['height']}")
+    for name, result in results["functions"].items():
+        if result["calls"]:
+            print(f"  {name:<28} {result['ops_per_sec']:>12.1f} ops/sec {result['mean_us']:>10.1f} us/call")
+        else:
+            print(f"  {name:<28} {'no samples':>12}")
+    print("end_to_end face detection: " + ", ".join(f"{name}={count}" for name, count in results["detection"].items()))
+    if args.output:
+        write_results(args.output, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# src/benchmarks/gaze_storage.py
+# On-disk size and read speed of the legacy stringified gaze_data rows versus the typed gaze_samples table.
+#
+# Usage: python src/benchmarks/gaze_storage.py --hours 3 --fps 30 --output data/benchmarks/gaze_storage.json
+import argparse
+import ast
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from benchmarks.harness import write_results
+from core.zones import ZONE_NAMES, ZONE_NONE, ZONE_OFF_ROAD, ZONE_ROAD, zone_name
+from utils.database import INSERT_GAZE_SQL, Database
+
+USER = 'benchmark_user'
+
+
+def synthetic_session(hours, fps, seed=0):
+    """Mostly-road gaze with mirror/dashboard glances and dropouts, as typed columns."""
+    rng = np.random.default_rng(seed)
+    count = int(hours * 3600 * fps)
+    zones = rng.choice(list(ZONE_NAMES), size=count, p=[0.05, 0.7, 0.05, 0.05, 0.05, 0.05, 0.05]).astype(np.uint8)
+    screen_x = rng.normal(320, 80, count).astype(np.float32)
+    screen_y = rng.normal(240, 60, count).astype(np.float32)
+    screen_x[zones == ZONE_NONE] = np.nan
+    screen_y[zones == ZONE_NONE] = np.nan
+    return {"timestamp": np.arange(count) / fps, "screen_x": screen_x, "screen_y": screen_y, "zone": zones}
+
+
+def legacy_rows(columns, start_time):
+    # What the TEXT schema holds: a wall-clock string and one stringified value per row
+    rows = []
+    for timestamp, screen_x, screen_y, zone in zip(columns["timestamp"].tolist(), columns["screen_x"].tolist(),
+                                                   columns["screen_y"].tolist(), columns["zone"].tolist()):
+        wall_clock = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(start_time + timestamp))
+        if zone != ZONE_NONE:
+            rows.append((USER, wall_clock, str({"screen_x": screen_x, "screen_y": screen_y, "zone": zone_name(zone)}), None))
+    return rows
+
+
+def database_size(db):
+    db.writer.flush()
+    page_count = db.connection.execute('PRAGMA page_count').fetchone()[0]
+    page_size = db.connection.execute('PRAGMA page_size').fetchone()[0]
+    return page_count * page_size
+
+
+def read_legacy(db):
+    rows = db.retrieve_gaze_data(USER)
+    parsed = [ast.literal_eval(gaze_direction) for _, _, gaze_direction in rows]
+    return sum(1 for sample in parsed if sample["zone"] == ZONE_NAMES[ZONE_ROAD])
+
+
+def read_typed(db, session_id):
+    columns = db.export_gaze_samples(session_id)
+    return int(np.count_nonzero(columns["zone"] == ZONE_ROAD))
+
+
+def timed(function, *args, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def run(hours, fps, repeat):
+    columns = synthetic_session(hours, fps)
+    with tempfile.TemporaryDirectory() as directory:
+        legacy_db = Database(os.path.join(directory, 'legacy.db'))
+        typed_db = Database(os.path.join(directory, 'typed.db'))
+        try:
+            rows = legacy_rows(columns, time.time())
+            start = time.perf_counter()
+            with legacy_db.connection:
+                legacy_db.connection.executemany(INSERT_GAZE_SQL, rows)
+            legacy_write = time.perf_counter() - start
+
+            session_id = typed_db.start_session(USER)
+            start = time.perf_counter()
+            typed_db.import_gaze_samples(session_id, columns)
+            typed_write = time.perf_counter() - start
+
+            legacy_size = database_size(legacy_db)
+            typed_size = database_size(typed_db)
+            legacy_road, legacy_read = timed(read_legacy, legacy_db, repeat=repeat)
+            typed_road, typed_read = timed(read_typed, typed_db, session_id, repeat=repeat)
+        finally:
+            legacy_db.close()
+            typed_db.close()
+
+    if legacy_road != typed_road:
+        raise AssertionError(f"Road sample counts differ: legacy {legacy_road}, typed {typed_road}")
+    return {
+        "hours": hours,
+        "fps": fps,
+        "samples": len(columns["zone"]),
+        "off_road_samples": int(np.count_nonzero(columns["zone"] == ZONE_OFF_ROAD)),
+        "legacy": {"rows": len(rows), "bytes": legacy_size, "write_s": legacy_write, "read_s": legacy_read},
+        "typed": {"rows": len(columns["zone"]), "bytes": typed_size, "write_s": typed_write, "read_s": typed_read},
+        "size_ratio": legacy_size / typed_size,
+        "read_speedup": legacy_read / typed_read,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gaze storage size and query benchmark")
+    parser.add_argument("--hours", type=float, default=3.0, help="Length of the synthetic session")
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    results = run(args.hours, args.fps, args.repeat)
+    print(f"{results['samples']} samples ({results['hours']} h at {results['fps']} FPS)")
+    for name in ("legacy", "typed"):
+        result = results[name]
+        print(f"  {name:<7} {result['rows']:>9} rows {result['bytes'] / 1e6:>8.1f} MB "
+              f"write {result['write_s']:6.2f}s read {result['read_s']:6.2f}s")
+    print(f"  {results['size_ratio']:.1f}x smaller, {results['read_speedup']:.1f}x faster to read")
+    if args.output:
+        write_results(args.output, results)
+
+
+if __name__ == "__main__":
+    main()
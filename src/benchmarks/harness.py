@@ -0,0 +1,91 @@
+# src/benchmarks/harness.py
+# Shared helpers for the benchmark scripts: frame fixtures, timing and JSON results.
+import datetime
+import json
+import os
+import platform
+import time
+
+import cv2
+import numpy as np
+
+
+def record_fixture(video_path, fixture_path, max_frames, calibration_path=None):
+    """Save the first ``max_frames`` frames of a recording (and optionally a calibration) as a .npz fixture."""
+    frames = load_frames(video_path, max_frames)
+    fixture = {"frames": np.stack(frames)}
+    if calibration_path:
+        with open(calibration_path) as f:
+            fixture["calibration"] = np.array(f.read())
+    os.makedirs(os.path.dirname(fixture_path) or '.', exist_ok=True)
+    np.savez_compressed(fixture_path, **fixture)
+    return len(frames)
+
+
+def load_frames(source, max_frames=None):
+    """Load BGR frames from a .npz fixture or a video file."""
+    if source.endswith('.npz'):
+        frames = np.load(source)["frames"]
+        return list(frames[:max_frames])
+    cap = cv2.VideoCapture(source)
+    frames = []
+    while max_frames is None or len(frames) < max_frames:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def load_fixture_calibration(source):
+    """Return the calibration JSON stored in a .npz fixture, or None."""
+    if not source.endswith('.npz'):
+        return None
+    with np.load(source) as fixture:
+        if "calibration" not in fixture:
+            return None
+        return json.loads(str(fixture["calibration"]))
+
+
+def measure(function, samples, repeat=3, min_seconds=0.2):
+    """Call ``function(*sample)`` for every sample, repeating until ``repeat`` passes and ``min_seconds`` elapsed."""
+    if not samples:
+        return {"calls": 0}
+    calls = 0
+    passes = 0
+    start = time.perf_counter()
+    while passes < repeat or time.perf_counter() - start < min_seconds:
+        for sample in samples:
+            function(*sample)
+        calls += len(samples)
+        passes += 1
+    elapsed = time.perf_counter() - start
+    return {
+        "calls": calls,
+        "mean_us": elapsed / calls * 1e6,
+        "ops_per_sec": calls / elapsed,
+    }
+
+
+def environment():
+    versions = {"numpy": np.__version__, "opencv": cv2.__version__}
+    try:
+        import dlib
+        versions["dlib"] = getattr(dlib, "__version__", "unknown")
+    except ImportError:
+        pass
+    return {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "versions": versions,
+    }
+
+
+def write_results(file_path, results):
+    os.makedirs(os.path.dirname(file_path) or '.', exist_ok=True)
+    with open(file_path, "w") as f:
+        json.dump({"environment": environment(), **results}, f, indent=2)
@@ -0,0 +1,119 @@
+# src/benchmarks/iris_localization.py
+# Microbenchmark of the full-frame-mask iris localizer against the crop-local one in EyeTracker.
+#
+# Usage: python src/benchmarks/iris_localization.py recording.avi
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from benchmarks.harness import load_frames, write_results
+from core.gaze_detection import EyeTracker
+from core.landmarks import LEFT_EYE, RIGHT_EYE, shape_to_array
+from core.models import DEFAULT_PREDICTOR_PATH, registry
+
+
+def legacy_get_iris_position(eye_region, frame, gray):
+    # Original implementation: full-frame mask, cropped afterwards
+    mask = np.zeros((frame.shape[0], frame.shape[1]), dtype=np.uint8)
+    cv2.fillPoly(mask, [np.array(eye_region, dtype=np.int32)], 255)
+    eye = cv2.bitwise_and(gray, gray, mask=mask)
+
+    min_x = np.min(np.array(eye_region)[:, 0])
+    max_x = np.max(np.array(eye_region)[:, 0])
+    min_y = np.min(np.array(eye_region)[:, 1])
+    max_y = np.max(np.array(eye_region)[:, 1])
+    eye = eye[min_y:max_y, min_x:max_x]
+
+    eye = cv2.equalizeHist(eye)
+    threshold = cv2.adaptiveThreshold(eye, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY_INV, 11, 2)
+    mask_eye = mask[min_y:max_y, min_x:max_x]
+    eye_masked = cv2.bitwise_and(threshold, threshold, mask=mask_eye)
+
+    contours, _ = cv2.findContours(eye_masked, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+    contours = sorted(contours, key=lambda x: cv2.contourArea(x), reverse=True)
+
+    if contours:
+        cnt = contours[0]
+        (x, y, w, h) = cv2.boundingRect(cnt)
+        iris_position = (x + int(w / 2), y + int(h / 2))
+        return (iris_position[0] + min_x, iris_position[1] + min_y)
+    return None
+
+
+def collect_eye_regions(tracker, frames):
+    samples = []
+    for frame in frames:
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        for face in tracker.detector(gray):
+            landmarks = shape_to_array(tracker.predictor(gray, face))
+            samples.append((tracker.get_eye_region(landmarks, LEFT_EYE), frame, gray))
+            samples.append((tracker.get_eye_region(landmarks, RIGHT_EYE), frame, gray))
+    return samples
+
+
+def inside_frame(eye_region, gray):
+    eye_region = np.asarray(eye_region)
+    height, width = gray.shape
+    return bool(eye_region.min() >= 0 and eye_region[:, 0].max() <= width and eye_region[:, 1].max() <= height)
+
+
+def time_function(function, samples, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for eye_region, frame, gray in samples:
+            function(eye_region, frame, gray)
+    return (time.perf_counter() - start) / (repeat * len(samples))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Iris localization microbenchmark")
+    parser.add_argument("video", help="Recorded .avi session or .npz frame fixture to replay")
+    parser.add_argument("--predictor", default=DEFAULT_PREDICTOR_PATH)
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    tracker = EyeTracker(args.predictor, video_source=None)
+    samples = collect_eye_regions(tracker, load_frames(args.video, args.frames))
+    if not samples:
+        sys.exit(f"No eyes were found in {args.video}")
+
+    # The two versions only agree on eyes inside the frame; edge eyes are counted separately
+    edge_samples = [sample for sample in samples if not inside_frame(sample[0], sample[2])]
+    mismatches = sum(legacy_get_iris_position(*sample) != tracker.get_iris_position(*sample)
+                     for sample in samples if inside_frame(sample[0], sample[2]))
+    edge_mismatches = sum(legacy_get_iris_position(*sample) != tracker.get_iris_position(*sample) for sample in edge_samples)
+    legacy_seconds = time_function(legacy_get_iris_position, samples, args.repeat)
+    crop_seconds = time_function(tracker.get_iris_position, samples, args.repeat)
+
+    height, width = samples[0][2].shape
+    results = {
+        "video": args.video,
+        "width": width,
+        "height": height,
+        "eye_samples": len(samples),
+        "mismatches": mismatches,
+        "edge_eye_samples": len(edge_samples),
+        "edge_mismatches": edge_mismatches,
+        "legacy_us": legacy_seconds * 1e6,
+        "crop_local_us": crop_seconds * 1e6,
+        "speedup": legacy_seconds / crop_seconds,
+        "model_load_seconds": registry.stats()["load_times"],
+    }
+    print(f"{len(samples)} eye crops from {width}x{height} frames, {mismatches} in-frame eyes differ")
+    print(f"{len(edge_samples)} eyes past the frame edge, {edge_mismatches} differ (polygon clipped to the frame)")
+    print(f"full-frame mask: {results['legacy_us']:.1f} us/eye")
+    print(f"crop-local mask: {results['crop_local_us']:.1f} us/eye ({results['speedup']:.1f}x)")
+
+    if args.output:
+        write_results(args.output, results)
+
+
+if __name__ == "__main__":
+    main()
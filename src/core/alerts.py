@@ -0,0 +1,126 @@
+# src/core/alerts.py
+# Non-blocking alert playback: the tracking loop only records a request, a worker thread plays it.
+import logging
+import threading
+import time
+import wave
+
+try:
+    import simpleaudio
+except ImportError:
+    simpleaudio = None
+
+ALERT_WARNING = 1
+ALERT_CRITICAL = 2
+
+# Minimum seconds between two plays of the same level; repeated triggers inside it are dropped
+ALERT_COOLDOWNS = {
+    ALERT_WARNING: 3.0,
+    ALERT_CRITICAL: 1.0,
+}
+
+
+def load_pcm(file_path):
+    """Read a WAV file into ``(frames, channels, sample_width, sample_rate)``."""
+    with wave.open(file_path, 'rb') as wav:
+        return wav.readframes(wav.getnframes()), wav.getnchannels(), wav.getsampwidth(), wav.getframerate()
+
+
+class AlertPlayer:
+    """Plays alert sounds on a dedicated thread so ``trigger`` returns in microseconds.
+
+    The sound is decoded to PCM once, up front. While a sound plays, further triggers coalesce into
+    one pending request at the highest level asked for, and each level has a cooldown so a condition
+    that persists for many frames sounds periodically instead of on every frame. Playback uses
+    simpleaudio with the preloaded buffer when it is installed and falls back to playsound.
+    """
+
+    def __init__(self, sound_paths, cooldowns=ALERT_COOLDOWNS):
+        # sound_paths: one file for every level, or {level: file}
+        if isinstance(sound_paths, str):
+            sound_paths = {level: sound_paths for level in cooldowns}
+        self.sound_paths = sound_paths
+        self.cooldowns = cooldowns
+        self.sounds = {}
+        if simpleaudio is not None:
+            for level, file_path in sound_paths.items():
+                try:
+                    self.sounds[level] = load_pcm(file_path)
+                except (OSError, wave.Error) as e:
+                    logging.error(f"Could not load alert sound {file_path}: {e}")
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.pending_level = 0
+        self.last_played = {level: float('-inf') for level in cooldowns}
+        self.playing = None  # simpleaudio PlayObject of the current sound
+        self.closed = False
+        self.thread = None
+        self.triggers = 0
+        self.plays = 0
+        self.suppressed = 0
+
+    def trigger(self, level=ALERT_WARNING):
+        """Request an alert; never blocks. Returns False if the level is still cooling down."""
+        with self.lock:
+            self.triggers += 1
+            if self.closed or time.monotonic() - self.last_played[level] < self.cooldowns[level] or level <= self.pending_level:
+                self.suppressed += 1
+                return False
+            self.pending_level = level
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name="alerts", daemon=True)
+                self.thread.start()
+        self.wake.set()
+        return True
+
+    def cancel(self):
+        """Drop a pending alert and cut the current sound short (the condition has cleared)."""
+        with self.lock:
+            self.pending_level = 0
+            playing = self.playing
+        if playing is not None:
+            playing.stop()
+
+    def close(self):
+        """Stop the worker thread; the player cannot be used afterwards."""
+        with self.lock:
+            self.closed = True
+        self.cancel()
+        self.wake.set()
+        if self.thread is not None:
+            self.thread.join(timeout=2.0)
+
+    def run(self):
+        while True:
+            self.wake.wait()
+            if self.closed:
+                break
+            with self.lock:
+                level, self.pending_level = self.pending_level, 0
+                self.wake.clear()
+                if not level or time.monotonic() - self.last_played[level] < self.cooldowns[level]:
+                    continue
+                self.last_played[level] = time.monotonic()
+                self.plays += 1
+            try:
+                self.play(level)
+            except Exception as e:
+                logging.error(f"Alert playback failed: {e}")
+
+    def play(self, level):
+        if level in self.sounds:
+            frames, channels, sample_width, sample_rate = self.sounds[level]
+            playing = simpleaudio.play_buffer(frames, channels, sample_width, sample_rate)
+            with self.lock:
+                self.playing = playing
+            playing.wait_done()
+            with self.lock:
+                self.playing = None
+        else:
+            # Only needed without simpleaudio, so playsound stays optional
+            from playsound import playsound
+            playsound(self.sound_paths[level])
+
+    def stats(self):
+        with self.lock:
+            return {"triggers": self.triggers, "plays": self.plays, "suppressed": self.suppressed}
@@ -0,0 +1,202 @@
+# src/core/batch_analysis.py
+# Headless re-analysis of recorded sessions (recording_<timestamp>.avi) with the EyeTracker pipeline.
+#
+# Usage: python src/core/batch_analysis.py recordings/ --calibration data/calibration.json --output data/batch
+#        add --workers 8 [--chunk-frames 6000] to fan sessions (or frame ranges of one session) out over processes
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from core.gaze_detection import EyeTracker
+from core.models import DEFAULT_PREDICTOR_PATH
+from core.zones import ZONE_NONE, zone_code
+from utils.gaze_export import export_columns, export_extension
+
+DEFAULT_FPS = 20.0  # Frame rate MainFrame records at
+
+
+def find_videos(source):
+    if os.path.isdir(source):
+        return sorted(os.path.join(source, name) for name in os.listdir(source) if name.endswith('.avi'))
+    return [source]
+
+
+class BatchAnalyzer:
+    """Runs detection, iris estimation and zone classification over recorded video without any display."""
+
+    def __init__(self, predictor_path, calibration_path, detection_scale=1.0, keyframe_interval=10):
+        self.tracker = EyeTracker(predictor_path, video_source=None, detection_scale=detection_scale, keyframe_interval=keyframe_interval)
+        self.calibration_data = self.tracker.load_calibration(calibration_path)
+
+    def analyze_video(self, video_path, start_frame=0, end_frame=None):
+        """Return per-frame gaze columns for ``[start_frame, end_frame)`` of ``video_path``."""
+        cap = cv2.VideoCapture(video_path)
+        fps = cap.get(cv2.CAP_PROP_FPS) or DEFAULT_FPS
+        if end_frame is None:
+            end_frame = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) or sys.maxsize
+        if start_frame:
+            seek(cap, video_path, start_frame)
+        self.tracker.face_tracker.reset()
+
+        frames, screen_x, screen_y, zones = [], [], [], []
+        frame_index = start_frame
+        while frame_index < end_frame:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            gazes = self.tracker.analyze_frame(frame, self.calibration_data)
+            frames.append(frame_index)
+            if gazes:
+                # The driver is the first face found
+                screen_x.append(gazes[0]["screen_position"][0])
+                screen_y.append(gazes[0]["screen_position"][1])
+                zones.append(zone_code(gazes[0]["zone"]))
+            else:
+                screen_x.append(np.nan)
+                screen_y.append(np.nan)
+                zones.append(ZONE_NONE)
+            frame_index += 1
+        cap.release()
+
+        frames = np.array(frames, dtype=np.int32)
+        return {
+            "frame": frames,
+            "timestamp": frames / fps,
+            "screen_x": np.array(screen_x, dtype=np.float32),
+            "screen_y": np.array(screen_y, dtype=np.float32),
+            "zone": np.array(zones, dtype=np.uint8),
+        }
+
+
+def seek(cap, video_path, frame_index):
+    cap.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
+    if int(cap.get(cv2.CAP_PROP_POS_FRAMES)) != frame_index:
+        # Backend cannot seek frame-accurately in this file; decode forward from the start instead
+        cap.open(video_path)
+        for _ in range(frame_index):
+            if not cap.grab():
+                break
+
+
+def frame_count(video_path):
+    cap = cv2.VideoCapture(video_path)
+    count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+    return count
+
+
+def plan_chunks(videos, chunk_frames=None):
+    """Split videos into ``(video_path, start_frame, end_frame)`` tasks of at most ``chunk_frames`` frames."""
+    tasks = []
+    for video_path in videos:
+        count = frame_count(video_path) if chunk_frames else 0
+        if count <= 0:
+            tasks.append((video_path, 0, None))
+            continue
+        for start in range(0, count, chunk_frames):
+            tasks.append((video_path, start, min(start + chunk_frames, count)))
+    return tasks
+
+
+def merge_chunks(chunks):
+    """Concatenate ``(start_frame, columns)`` chunk results of one video in frame order."""
+    chunks = [columns for _, columns in sorted(chunks, key=lambda chunk: chunk[0])]
+    return {name: np.concatenate([columns[name] for columns in chunks]) for name in chunks[0]}
+
+
+# Per-process analyzer, created once by the pool initializer so the predictor is loaded once per worker
+worker_analyzer = None
+
+
+def init_worker(predictor_path, calibration_path, detection_scale, keyframe_interval):
+    global worker_analyzer
+    worker_analyzer = BatchAnalyzer(predictor_path, calibration_path, detection_scale, keyframe_interval)
+
+
+def analyze_chunk(task):
+    video_path, start_frame, end_frame = task
+    start = time.perf_counter()
+    columns = worker_analyzer.analyze_video(video_path, start_frame, end_frame)
+    return video_path, start_frame, columns, time.perf_counter() - start
+
+
+def analyze_parallel(videos, predictor_path, calibration_path, workers, chunk_frames=None, detection_scale=1.0, keyframe_interval=10):
+    """Yield ``(video_path, columns, seconds)`` for each video as soon as all of its chunks are analyzed.
+
+    ``seconds`` is the time the workers spent on the video's chunks, summed over chunks.
+    """
+    tasks = plan_chunks(videos, chunk_frames)
+    remaining = {}
+    for video_path, _, _ in tasks:
+        remaining[video_path] = remaining.get(video_path, 0) + 1
+    chunks = {video_path: [] for video_path in remaining}
+    seconds = dict.fromkeys(remaining, 0.0)
+
+    initargs = (predictor_path, calibration_path, detection_scale, keyframe_interval)
+    with multiprocessing.Pool(workers, initializer=init_worker, initargs=initargs) as pool:
+        for video_path, start_frame, columns, chunk_seconds in pool.imap_unordered(analyze_chunk, tasks):
+            chunks[video_path].append((start_frame, columns))
+            seconds[video_path] += chunk_seconds
+            remaining[video_path] -= 1
+            if remaining[video_path] == 0:
+                yield video_path, merge_chunks(chunks.pop(video_path)), seconds.pop(video_path)
+
+
+def analyze_sequential(videos, predictor_path, calibration_path, detection_scale=1.0, keyframe_interval=10):
+    analyzer = BatchAnalyzer(predictor_path, calibration_path, detection_scale, keyframe_interval)
+    for video_path in videos:
+        start = time.perf_counter()
+        columns = analyzer.analyze_video(video_path)
+        yield video_path, columns, time.perf_counter() - start
+
+
+def write_columns(file_path, columns):
+    export_columns(file_path, columns)
+
+
+def output_path(output_dir, video_path):
+    name = os.path.splitext(os.path.basename(video_path))[0]
+    return os.path.join(output_dir, f"{name}_gaze{export_extension()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless gaze extraction for recorded sessions")
+    parser.add_argument("source", help="A recorded .avi file or a directory of them")
+    parser.add_argument("--calibration", default="data/calibration.json")
+    parser.add_argument("--predictor", default=DEFAULT_PREDICTOR_PATH)
+    parser.add_argument("--output", default="data/batch")
+    parser.add_argument("--detection-scale", type=float, default=1.0)
+    parser.add_argument("--keyframe-interval", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (0 uses every core)")
+    parser.add_argument("--chunk-frames", type=int, help="Split long sessions into frame ranges of this size")
+    args = parser.parse_args()
+
+    os.makedirs(args.output, exist_ok=True)
+    videos = find_videos(args.source)
+    workers = args.workers or os.cpu_count()
+    if workers > 1:
+        results = analyze_parallel(videos, args.predictor, args.calibration, workers, args.chunk_frames,
+                                   args.detection_scale, args.keyframe_interval)
+    else:
+        results = analyze_sequential(videos, args.predictor, args.calibration, args.detection_scale, args.keyframe_interval)
+
+    total_frames = 0
+    total_start = time.perf_counter()
+    for video_path, columns, seconds in results:
+        write_columns(output_path(args.output, video_path), columns)
+        count = len(columns["frame"])
+        total_frames += count
+        # Time spent analyzing this video (summed over its chunks), independent of completion order
+        print(f"{video_path}: {count} frames, {seconds:.1f}s of analysis ({count / max(seconds, 1e-9):.1f} frames/sec per worker)")
+    total_elapsed = time.perf_counter() - total_start
+    print(f"Total: {total_frames} frames in {total_elapsed:.1f}s ({total_frames / max(total_elapsed, 1e-9):.1f} frames/sec)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,10 @@
 # engagement_score.py
+from collections import deque
+
+import numpy as np
+
+from core.zones import (ZONE_DASHBOARD, ZONE_LEFT_MIRROR, ZONE_NONE, ZONE_OFF_ROAD, ZONE_REAR_MIRROR,
+                        ZONE_RIGHT_MIRROR, ZONE_ROAD, zone_name)
 
 # Define thresholds
 POSITIVE_THRESHOLD = 2  # seconds
@@ -48,3 +54,150 @@ def classify_gaze_duration(duration, threshold):
         return 0  # Neutral
     else:
         return -1  # Negative
+
+# Criteria of each gaze zone. A mirror or dashboard check held past its threshold scores
+# negative, which is the 'prolonged_check' case.
+ZONE_CRITERIA = {
+    ZONE_NONE: 'closed_eyes',
+    ZONE_ROAD: 'road_focus',
+    ZONE_LEFT_MIRROR: 'mirror_check',
+    ZONE_RIGHT_MIRROR: 'mirror_check',
+    ZONE_REAR_MIRROR: 'mirror_check',
+    ZONE_DASHBOARD: 'dashboard_check',
+    ZONE_OFF_ROAD: 'off_road_gaze',
+}
+
+# Sliding windows reported by EngagementScorer, in seconds
+SCORE_WINDOWS = (10, 60, 300)
+
+def sample_score(criteria_key, duration):
+    """Score of one sample that has been in its zone for ``duration`` seconds: 1, 0 or -1."""
+    criteria = ENGAGEMENT_CRITERIA[criteria_key]
+    result = classify_gaze_duration(duration, criteria['threshold'])
+    if not criteria['positive']:
+        return min(result, 0)  # A brief negative gaze is tolerated, never rewarded
+    return result
+
+def engagement_percentage(score, count):
+    if count == 0:
+        return 0  # Prevent division by zero
+    return ((score + count) / (2 * count)) * 100
+
+class EngagementScorer:
+    """Incremental engagement score over timestamped zone samples.
+
+    Each ``update`` scores the sample by how long its zone has been held (the dwell run), so the
+    ENGAGEMENT_CRITERIA thresholds apply to real durations. The whole-session score and every sliding
+    window are running sums, which makes an update O(1) amortized.
+    """
+
+    def __init__(self, windows=SCORE_WINDOWS):
+        self.windows = {window: deque() for window in windows}
+        self.window_scores = {window: 0 for window in windows}
+        self.total_score = 0
+        self.count = 0
+        self.run_zone = None
+        self.run_start = None
+        self.last_timestamp = None
+        self.dwell = {zone: 0.0 for zone in ZONE_CRITERIA}
+
+    def update(self, timestamp, zone):
+        """Add a sample of ``zone`` (a core.zones code) at ``timestamp`` seconds; returns the session score."""
+        if self.last_timestamp is not None:
+            # Time since the previous sample counts towards the zone it was in
+            self.dwell[self.run_zone] += timestamp - self.last_timestamp
+        if zone != self.run_zone:
+            self.run_zone = zone
+            self.run_start = timestamp
+        self.last_timestamp = timestamp
+
+        score = sample_score(ZONE_CRITERIA.get(zone, 'off_road_gaze'), timestamp - self.run_start)
+        self.total_score += score
+        self.count += 1
+        for window, samples in self.windows.items():
+            samples.append((timestamp, score))
+            self.window_scores[window] += score
+            while samples[0][0] <= timestamp - window:
+                self.window_scores[window] -= samples.popleft()[1]
+        return self.score()
+
+    def score(self, window=None):
+        """Engagement percentage of the whole session, or of the last ``window`` seconds."""
+        if window is None:
+            return engagement_percentage(self.total_score, self.count)
+        return engagement_percentage(self.window_scores[window], len(self.windows[window]))
+
+    def window_summary(self):
+        return {window: self.score(window) for window in self.windows}
+
+    def run_length(self):
+        """Seconds the current zone has been held."""
+        if self.run_start is None:
+            return 0.0
+        return self.last_timestamp - self.run_start
+
+    def zone_dwell(self):
+        """Total seconds spent in each zone, keyed by zone name."""
+        return {zone_name(zone) or 'No Gaze': seconds for zone, seconds in self.dwell.items()}
+
+def criteria_tables():
+    """Per-zone-code lookup arrays (threshold, has_threshold, positive) for vectorized scoring."""
+    thresholds = np.zeros(256, dtype=np.float64)
+    has_threshold = np.ones(256, dtype=bool)
+    positive = np.zeros(256, dtype=bool)
+    for zone in range(256):
+        criteria = ENGAGEMENT_CRITERIA[ZONE_CRITERIA.get(zone, 'off_road_gaze')]
+        has_threshold[zone] = criteria['threshold'] is not None
+        thresholds[zone] = criteria['threshold'] or 0
+        positive[zone] = criteria['positive']
+    return thresholds, has_threshold, positive
+
+ZONE_THRESHOLDS, ZONE_HAS_THRESHOLD, ZONE_POSITIVE = criteria_tables()
+
+def sample_scores(timestamps, zones):
+    """Per-sample scores (1, 0 or -1) of a whole session, identical to EngagementScorer.update."""
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    zones = np.asarray(zones, dtype=np.uint8)
+    count = len(zones)
+    if count == 0:
+        return np.empty(0, dtype=np.int8)
+
+    # Dwell duration of each sample: time since the first sample of its run of equal zones
+    run_start = np.empty(count, dtype=bool)
+    run_start[0] = True
+    np.not_equal(zones[1:], zones[:-1], out=run_start[1:])
+    start_index = np.maximum.accumulate(np.where(run_start, np.arange(count), 0))
+    duration = timestamps - timestamps[start_index]
+
+    # classify_gaze_duration, then negative criteria capped at neutral (see sample_score)
+    thresholds = ZONE_THRESHOLDS[zones]
+    scores = np.where(duration < thresholds, 1, np.where(duration == thresholds, 0, -1)).astype(np.int8)
+    scores[~ZONE_HAS_THRESHOLD[zones]] = 1
+    np.minimum(scores, 0, out=scores, where=~ZONE_POSITIVE[zones])
+    return scores
+
+def score_session(timestamps, zones, windows=SCORE_WINDOWS):
+    """Score a recorded session in one pass of array operations.
+
+    Returns the session percentage, the percentage of each trailing window at the end of the session
+    and the seconds spent in each zone, matching an EngagementScorer fed the same samples.
+    """
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    zones = np.asarray(zones, dtype=np.uint8)
+    scores = sample_scores(timestamps, zones)
+    count = len(scores)
+
+    window_scores = {}
+    for window in windows:
+        if count == 0:
+            window_scores[window] = engagement_percentage(0, 0)
+            continue
+        in_window = timestamps > timestamps[-1] - window
+        window_scores[window] = engagement_percentage(int(scores[in_window].sum()), int(in_window.sum()))
+
+    dwell = np.bincount(zones[:-1], weights=np.diff(timestamps), minlength=256) if count > 1 else np.zeros(256)
+    return {
+        "score": engagement_percentage(int(scores.sum()), count),
+        "windows": window_scores,
+        "zone_dwell": {zone_name(zone) or 'No Gaze': float(dwell[zone]) for zone in ZONE_CRITERIA},
+    }
@@ -1,12 +1,12 @@
 import cv2
-import dlib
 import numpy as np
-from scipy.spatial import distance as dist
+from core.landmarks import shape_to_array
+from core.models import get_detector, get_predictor
 
 class EyeTracking:
     def __init__(self):
-        self.detector = dlib.get_frontal_face_detector()
-        self.predictor = dlib.shape_predictor("src/models/shape_predictor_68_face_landmarks_GTX.dat")
+        self.detector = get_detector()
+        self.predictor = get_predictor()
         self.camera = None
         self.max_score = 100  # Example value, adjust based on your criteria
 
@@ -30,8 +30,7 @@ class EyeTracking:
         gaze_data = []
 
         for rect in rects:
-            shape = self.predictor(gray, rect)
-            shape = np.array([[p.x, p.y] for p in shape.parts()])
+            shape = shape_to_array(self.predictor(gray, rect))
 
             left_eye = shape[42:48]
             right_eye = shape[36:42]
@@ -50,10 +49,10 @@ class EyeTracking:
         return gaze_data
 
     def eye_aspect_ratio(self, eye):
-        A = dist.euclidean(eye[1], eye[5])
-        B = dist.euclidean(eye[2], eye[4])
-        C = dist.euclidean(eye[0], eye[3])
-        ear = (A + B) / (2.0 * C)
+        # Both vertical distances (p2-p6, p3-p5) in one call, over the horizontal one (p1-p4)
+        vertical = np.linalg.norm(eye[[1, 2]] - eye[[5, 4]], axis=1)
+        horizontal = np.linalg.norm(eye[0] - eye[3])
+        ear = vertical.sum() / (2.0 * horizontal)
         return ear
 
     def get_gaze_ratio(self, eye, gray):
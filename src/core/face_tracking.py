@@ -0,0 +1,104 @@
+# src/core/face_tracking.py
+import cv2
+import dlib
+import numpy as np
+
+
+def detect_faces(detector, gray, scale=1.0):
+    """Run ``detector`` on a copy of ``gray`` resized by ``scale`` and map the rectangles back.
+
+    Landmarks should still be predicted on the full-resolution image; only the
+    HOG pass benefits from the smaller input.
+    """
+    if scale == 1.0:
+        return list(detector(gray))
+    small = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    return [dlib.rectangle(int(face.left() / scale), int(face.top() / scale),
+                           int(face.right() / scale), int(face.bottom() / scale))
+            for face in detector(small)]
+
+
+class FaceTracker:
+    """Runs the full-frame HOG detector only on keyframes.
+
+    Between keyframes the detector is run on a padded region of interest around
+    the previous face rectangle or, with ``seed_from_landmarks``, the previous
+    frame's landmarks are used directly as the predictor's face rectangle. A full
+    detection is forced every ``keyframe_interval`` frames or as soon as the
+    track is lost. Every detector pass runs at ``detection_scale``.
+    """
+
+    def __init__(self, detector, keyframe_interval=10, roi_padding=0.5, seed_from_landmarks=False, detection_scale=1.0):
+        self.detector = detector
+        self.detection_scale = detection_scale
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.roi_padding = roi_padding
+        self.seed_from_landmarks = seed_from_landmarks
+        self.faces = []
+        self.landmark_faces = []
+        self.frames_since_keyframe = 0
+        self.full_detections = 0
+        self.roi_detections = 0
+        self.seeded_frames = 0
+        self.track_losses = 0
+
+    def reset(self):
+        self.faces = []
+        self.landmark_faces = []
+        self.frames_since_keyframe = 0
+
+    def detect(self, gray):
+        # Landmarks recorded during the previous frame seed this one only
+        seeds, self.landmark_faces = self.landmark_faces, []
+        if self.faces and self.frames_since_keyframe < self.keyframe_interval - 1:
+            faces = self.track(gray, seeds)
+            if faces:
+                self.frames_since_keyframe += 1
+                self.faces = faces
+                return faces
+            self.track_losses += 1
+
+        self.full_detections += 1
+        self.frames_since_keyframe = 0
+        self.faces = detect_faces(self.detector, gray, self.detection_scale)
+        return self.faces
+
+    def track(self, gray, seeds):
+        if self.seed_from_landmarks and len(seeds) == len(self.faces):
+            self.seeded_frames += 1
+            return seeds
+
+        self.roi_detections += 1
+        faces = []
+        for face in self.faces:
+            left, top, right, bottom = self.padded_roi(face, gray.shape)
+            roi = np.ascontiguousarray(gray[top:bottom, left:right])
+            for found in detect_faces(self.detector, roi, self.detection_scale):
+                faces.append(dlib.rectangle(found.left() + left, found.top() + top,
+                                            found.right() + left, found.bottom() + top))
+        return faces
+
+    def padded_roi(self, face, shape):
+        pad_x = int(face.width() * self.roi_padding)
+        pad_y = int(face.height() * self.roi_padding)
+        left = max(0, face.left() - pad_x)
+        top = max(0, face.top() - pad_y)
+        right = min(shape[1], face.right() + pad_x)
+        bottom = min(shape[0], face.bottom() + pad_y)
+        return left, top, right, bottom
+
+    def update(self, landmarks):
+        """Record the ``(68, 2)`` landmark array predicted for this frame to seed the next one."""
+        if not self.seed_from_landmarks:
+            return
+        left, top = landmarks.min(axis=0)
+        right, bottom = landmarks.max(axis=0)
+        self.landmark_faces.append(dlib.rectangle(int(left), int(top), int(right), int(bottom)))
+
+    def stats(self):
+        return {
+            "full_detections": self.full_detections,
+            "roi_detections": self.roi_detections,
+            "seeded_frames": self.seeded_frames,
+            "track_losses": self.track_losses,
+        }
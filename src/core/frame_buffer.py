@@ -0,0 +1,118 @@
+# src/core/frame_buffer.py
+import threading
+import time
+import numpy as np
+
+
+class FrameRingBuffer:
+    """Fixed-size ring of preallocated frames with a "latest frame wins" policy.
+
+    The capture thread writes into a free slot and publishes it; the consumer
+    always receives the newest published frame. Frames that were published but
+    never consumed are counted as dropped.
+    """
+
+    def __init__(self, capacity=3):
+        if capacity < 3:
+            raise ValueError("capacity must be at least 3 (writing, published and held slots)")
+        self.capacity = capacity
+        self.slots = None
+        self.condition = threading.Condition()
+        self.write_index = 0
+        self.published_index = None
+        self.held_index = None
+        self.sequence = 0
+        self.consumed_sequence = 0
+        self.frames_captured = 0
+        self.frames_processed = 0
+        self.frames_dropped = 0
+
+    def allocate(self, shape, dtype=np.uint8):
+        self.slots = [np.empty(shape, dtype=dtype) for _ in range(self.capacity)]
+
+    def acquire_write_slot(self, shape, dtype=np.uint8):
+        with self.condition:
+            if self.slots is None or self.slots[0].shape != tuple(shape):
+                self.allocate(shape, dtype)
+                self.published_index = None
+                self.held_index = None
+            index = (self.write_index + 1) % self.capacity
+            while index == self.published_index or index == self.held_index:
+                index = (index + 1) % self.capacity
+            self.write_index = index
+            return index, self.slots[index]
+
+    def publish(self, index):
+        with self.condition:
+            if self.published_index is not None and self.sequence > self.consumed_sequence:
+                self.frames_dropped += 1
+            self.published_index = index
+            self.sequence += 1
+            self.frames_captured += 1
+            self.condition.notify_all()
+
+    def latest(self, timeout=1.0):
+        """Return ``(sequence, frame)`` for the newest unseen frame, or ``(None, None)`` on timeout.
+
+        The returned array stays valid until the next call to ``latest``.
+        """
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.sequence > self.consumed_sequence, timeout):
+                return None, None
+            self.held_index = self.published_index
+            self.consumed_sequence = self.sequence
+            self.frames_processed += 1
+            return self.sequence, self.slots[self.held_index]
+
+    def stats(self):
+        with self.condition:
+            return {
+                "captured": self.frames_captured,
+                "processed": self.frames_processed,
+                "dropped": self.frames_dropped,
+            }
+
+
+class CaptureThread(threading.Thread):
+    """Reads frames from a ``cv2.VideoCapture`` into a ``FrameRingBuffer``."""
+
+    def __init__(self, cap, buffer=None):
+        super().__init__(daemon=True)
+        self.cap = cap
+        self.buffer = buffer if buffer is not None else FrameRingBuffer()
+        self.running = threading.Event()
+        self.running.set()
+        self.failed_reads = 0
+
+    def run(self):
+        slot = None
+        while self.running.is_set():
+            if slot is None:
+                ret, frame = self.cap.read()
+                if not ret:
+                    self.failed_reads += 1
+                    time.sleep(0.005)
+                    continue
+                index, slot = self.buffer.acquire_write_slot(frame.shape, frame.dtype)
+                np.copyto(slot, frame)
+            else:
+                index, slot = self.buffer.acquire_write_slot(slot.shape, slot.dtype)
+                ret, frame = self.cap.read(slot)
+                if not ret:
+                    self.failed_reads += 1
+                    time.sleep(0.005)
+                    continue
+                if frame is not slot:
+                    # Resolution changed; reallocate the ring on the next iteration
+                    slot = None
+                    continue
+            self.buffer.publish(index)
+
+    def read(self, timeout=1.0):
+        _, frame = self.buffer.latest(timeout)
+        return frame is not None, frame
+
+    def stop(self):
+        self.running.clear()
+        if self.is_alive():
+            self.join(timeout=2.0)
@@ -1,52 +1,136 @@
 import cv2
-import dlib
 import numpy as np
 import pandas as pd
 import time
 import os
-from playsound import playsound
+import json
+import threading
+from core.frame_buffer import CaptureThread, FrameRingBuffer
+from core.alerts import ALERT_CRITICAL, ALERT_WARNING, AlertPlayer
+from core.engagement_score import EngagementScorer
+from core.face_tracking import FaceTracker
+from core.gaze_log import FLAG_ALERT, GazeLogReader, GazeLogWriter
+from core.landmarks import LEFT_EYE, RIGHT_EYE, shape_to_array
+from core.models import get_detector, get_predictor
+from core.pipeline import GazePipeline
+from core.profiling import Profiler
+from core.zones import ZONE_NONE, ZONE_OFF_ROAD, ZONE_ROAD, zone_code, zone_name
+from utils.gaze_export import export_columns
+
+# Zone reported by classify_gaze when the gaze falls inside the calibrated screen area
+ROAD_ZONE = 'Road'
 
 class EyeTracker:
-    def __init__(self, predictor_path, video_source=0):
+    def __init__(self, predictor_path, video_source=0, frame_buffer_size=3, keyframe_interval=10, seed_from_landmarks=False, detection_scale=1.0, profile=False, profile_overlay=False):
         self.predictor_path = predictor_path
-        self.detector = dlib.get_frontal_face_detector()
-        self.predictor = dlib.shape_predictor(predictor_path)
-        self.cap = cv2.VideoCapture(video_source)
+        # Shared with every other tracker in the process; only the first one loads them
+        self.detector = get_detector()
+        self.predictor = get_predictor(predictor_path)
+        self.face_tracker = FaceTracker(self.detector, keyframe_interval=keyframe_interval, seed_from_landmarks=seed_from_landmarks, detection_scale=detection_scale)
+        self.cap = cv2.VideoCapture(video_source) if video_source is not None else None
+        self.frame_buffer_size = frame_buffer_size
+        self.capture_thread = None
+        self.capture_stats_summary = None
+        self.pipeline_stats_summary = None
+        self.profiler = Profiler(enabled=profile, show_overlay=profile_overlay)
+        self.iris_mask_buffer = np.zeros((32, 64), dtype=np.uint8)
+        self.iris_eye_buffer = np.zeros((32, 64), dtype=np.uint8)
         self.gaze_data = []
+        self.frame_samples = []  # (timestamp, screen_x, screen_y, zone) recorded for the last processed frame
+        self.gaze_log = None
+        self.gaze_log_path = None
+        self.engagement = EngagementScorer()
+        self.stop_event = threading.Event()
+        self.capture_event = threading.Event()  # Set by request_capture() to confirm the current calibration step
+        self.on_calibration_frame = None
+        self.show_window = True
+        self.on_capture = None
+        self.on_frame = None
         self.start_time = time.time()
         self.missing_eye_start_time = None
         self.standard_distance_centers = None
         self.standard_screen_distance = 50
         self.alert_sound_path = os.path.join(os.path.dirname(__file__), '..', 'utils', 'alert_sound.wav')
+        self.alerts = AlertPlayer(self.alert_sound_path)
+
+
+    def start_capture(self):
+        if self.capture_thread is None:
+            self.capture_thread = CaptureThread(self.cap, FrameRingBuffer(self.frame_buffer_size))
+            self.capture_thread.start()
 
+    def stop_capture(self):
+        if self.capture_thread is not None:
+            self.capture_thread.stop()
+            self.capture_thread = None
+
+    def read_frame(self):
+        # Newest frame from the capture thread when it runs, otherwise a blocking read
+        start = self.profiler.start()
+        if self.capture_thread is not None:
+            ret, frame = self.capture_thread.read()
+        else:
+            ret, frame = self.cap.read()
+        self.profiler.record("capture", start)
+        return ret, frame
+
+    def capture_stats(self):
+        if self.capture_thread is None:
+            return None
+        return self.capture_thread.buffer.stats()
+
+    def detection_stats(self):
+        return self.face_tracker.stats()
 
     def midpoint(self, point1, point2):
         return (int((point1[0] + point2[0]) / 2), int((point1[1] + point2[1]) / 2))
 
     def get_eye_region(self, landmarks, eye_points):
-        return [(landmarks.part(point).x, landmarks.part(point).y) for point in eye_points]
+        # landmarks is the (68, 2) array from shape_to_array; eye_points a slice or index list
+        return landmarks[eye_points]
 
     def get_eye_center(self, landmarks, eye_points):
-        eye_region = [(landmarks.part(point).x, landmarks.part(point).y) for point in eye_points]
+        eye_region = landmarks[eye_points]
         eye_center = self.midpoint(eye_region[0], eye_region[3])
         return eye_center
 
+    def get_iris_scratch(self, height, width):
+        # Reusable mask/eye buffers, grown to the largest eye crop seen so far
+        if self.iris_mask_buffer.shape[0] < height or self.iris_mask_buffer.shape[1] < width:
+            shape = (max(height, self.iris_mask_buffer.shape[0]), max(width, self.iris_mask_buffer.shape[1]))
+            self.iris_mask_buffer = np.zeros(shape, dtype=np.uint8)
+            self.iris_eye_buffer = np.zeros(shape, dtype=np.uint8)
+        return self.iris_mask_buffer[:height, :width], self.iris_eye_buffer[:height, :width]
+
     def get_iris_position(self, eye_region, frame, gray):
-        mask = np.zeros((frame.shape[0], frame.shape[1]), dtype=np.uint8)
-        cv2.fillPoly(mask, [np.array(eye_region, dtype=np.int32)], 255)
-        eye = cv2.bitwise_and(gray, gray, mask=mask)
-        
-        min_x = np.min(np.array(eye_region)[:, 0])
-        max_x = np.max(np.array(eye_region)[:, 0])
-        min_y = np.min(np.array(eye_region)[:, 1])
-        max_y = np.max(np.array(eye_region)[:, 1])
-        eye = eye[min_y:max_y, min_x:max_x]
-        
+        """Return the iris center in frame coordinates, or None if no iris contour is found.
+
+        Matches the original full-frame-mask version for eyes that lie inside the frame. For an eye
+        past the frame edge the polygon is clipped to the frame, while the original sliced with the
+        unclamped bounds, so the two can disagree there (see benchmarks/iris_localization.py).
+        """
+        eye_region = np.asarray(eye_region, dtype=np.int32)
+        min_x, min_y = np.maximum(eye_region.min(axis=0), 0)
+        max_x = min(eye_region[:, 0].max(), gray.shape[1])
+        max_y = min(eye_region[:, 1].max(), gray.shape[0])
+        if max_x <= min_x or max_y <= min_y:
+            return None
+
+        # Build the eye mask on the crop only instead of a full-frame mask. The polygon is
+        # rasterized with a one pixel margin so OpenCV does not clip it at the crop edge.
+        height, width = max_y - min_y, max_x - min_x
+        mask, eye = self.get_iris_scratch(height + 1, width + 1)
+        mask.fill(0)
+        cv2.fillPoly(mask, [eye_region - np.array([min_x, min_y], dtype=np.int32)], 255)
+        mask = mask[:height, :width]
+        eye = eye[:height, :width]
+        eye.fill(0)
+        cv2.bitwise_and(gray[min_y:max_y, min_x:max_x], gray[min_y:max_y, min_x:max_x], dst=eye, mask=mask)
+
         eye = cv2.equalizeHist(eye)
         threshold = cv2.adaptiveThreshold(eye, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY_INV, 11, 2)
-        mask_eye = mask[min_y:max_y, min_x:max_x]
-        eye_masked = cv2.bitwise_and(threshold, threshold, mask=mask_eye)
-        
+        eye_masked = cv2.bitwise_and(threshold, threshold, mask=mask)
+
         contours, _ = cv2.findContours(eye_masked, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
         contours = sorted(contours, key=lambda x: cv2.contourArea(x), reverse=True)
 
@@ -54,19 +138,39 @@ class EyeTracker:
             cnt = contours[0]
             (x, y, w, h) = cv2.boundingRect(cnt)
             iris_position = (x + int(w / 2), y + int(h / 2))
-            return (iris_position[0] + min_x, iris_position[1] + min_y)
+            return (int(iris_position[0] + min_x), int(iris_position[1] + min_y))
         return None
 
+    def calibration_step_done(self, window_name, frame, step):
+        """Show one calibration frame; True once the step is confirmed with 'c' or request_capture()."""
+        if self.on_calibration_frame is not None:
+            self.on_calibration_frame(frame, step)
+        key = -1
+        if self.show_window:
+            cv2.imshow(window_name, frame)
+            key = cv2.waitKey(1)
+        if key == ord('c') or self.capture_event.is_set():
+            self.capture_event.clear()
+            return True
+        return False
+
+    def request_capture(self):
+        """Confirm the current calibration step, like pressing 'c'; safe to call from any thread."""
+        self.capture_event.set()
+
     def get_eye_to_eye_distance(self):
-        while True:
+        eye_distance_pixels = None
+        self.capture_event.clear()
+        while not self.stop_event.is_set():
             _, frame = self.cap.read()
             gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            faces = self.detector(gray)
+            faces = self.face_tracker.detect(gray)
             
             for face in faces:
-                landmarks = self.predictor(gray, face)
-                left_eye_center = self.get_eye_center(landmarks, [36, 37, 38, 39, 40, 41])
-                right_eye_center = self.get_eye_center(landmarks, [42, 43, 44, 45, 46, 47])
+                landmarks = shape_to_array(self.predictor(gray, face))
+                self.face_tracker.update(landmarks)
+                left_eye_center = self.get_eye_center(landmarks, LEFT_EYE)
+                right_eye_center = self.get_eye_center(landmarks, RIGHT_EYE)
                 eye_distance_pixels = np.linalg.norm(np.array(left_eye_center) - np.array(right_eye_center))
                 
                 cv2.circle(frame, left_eye_center, 2, (0, 255, 0), -1)
@@ -74,51 +178,65 @@ class EyeTracker:
                 cv2.putText(frame, "Stand around 50 cm from the camera", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 0, 0), 2)
                 cv2.putText(frame, f"Eye Distance: {eye_distance_pixels:.2f} pixels", (10, 50), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
             
-            cv2.imshow("Frame", frame)
-            key = cv2.waitKey(1)
-            if key == ord('c'):
+            if self.calibration_step_done("Frame", frame, None):
                 break
         return eye_distance_pixels
 
-    def calibrate(self, calibration_points):
+    def calibrate(self, calibration_points, on_calibration_frame=None, show_window=True):
+        """Measure the eye distance, then record the gaze at each calibration point.
+
+        Each step is confirmed with 'c' in the OpenCV window or with request_capture().
+        ``on_calibration_frame(frame, point)`` sees every annotated frame, ``point`` being None during the
+        eye distance step. With ``show_window=False`` no OpenCV window is opened, as in start_tracking.
+        """
+        self.on_calibration_frame = on_calibration_frame
+        self.show_window = show_window
         calibration_data = []
         self.standard_distance_centers = self.get_eye_to_eye_distance()
 
         for point in calibration_points:
-            while True:
+            self.capture_event.clear()
+            # request_stop() abandons the calibration; the partial result is returned
+            while not self.stop_event.is_set():
                 _, frame = self.cap.read()
                 gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                faces = self.detector(gray)
+                faces = self.face_tracker.detect(gray)
                 cv2.putText(frame, f"Look at point: {point}", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 0, 0), 2)
-                cv2.imshow("Calibration", frame)
-                key = cv2.waitKey(1)
-                if key == ord('c'):
+                if self.calibration_step_done("Calibration", frame, point):
                     for face in faces:
-                        landmarks = self.predictor(gray, face)
-                        left_eye_region = self.get_eye_region(landmarks, [36, 37, 38, 39, 40, 41])
-                        right_eye_region = self.get_eye_region(landmarks, [42, 43, 44, 45, 46, 47])
-                        
-                        left_iris_position = self.get_iris_position(left_eye_region, frame, gray)
-                        right_iris_position = self.get_iris_position(right_eye_region, frame, gray)
-
-                        if left_iris_position and right_iris_position:
-                            avg_iris_position_x = (left_iris_position[0] + right_iris_position[0]) / 2
-                            avg_iris_position_y = (left_iris_position[1] + right_iris_position[1]) / 2
-
-                            left_eye_center = self.midpoint(left_eye_region[0], left_eye_region[3])
-                            right_eye_center = self.midpoint(right_eye_region[0], right_eye_region[3])
-                            avg_eye_center_x = (left_eye_center[0] + right_eye_center[0]) / 2
-                            avg_eye_center_y = (left_eye_center[1] + right_eye_center[1]) / 2
-
-                            new_distance = self.calculate_eye_to_screen_distance(left_eye_center, right_eye_center, self.standard_distance_centers, self.standard_screen_distance)
-                            screen_position = self.map_to_screen((avg_iris_position_x, avg_iris_position_y), (avg_eye_center_x, avg_eye_center_y), new_distance)
-
+                        landmarks = shape_to_array(self.predictor(gray, face))
+                        self.face_tracker.update(landmarks)
+                        gaze = self.estimate_gaze(frame, gray, landmarks)
+                        if gaze:
+                            screen_position = gaze[2]
                             calibration_data.append((screen_position[0], screen_position[1], point))
                             break
                     break
-        cv2.destroyAllWindows()
+        self.on_calibration_frame = None
+        if self.show_window:
+            cv2.destroyAllWindows()
         return calibration_data
 
+    def calibration_dict(self, calibration_data):
+        return {
+            "standard_distance_centers": self.standard_distance_centers,
+            "standard_screen_distance": self.standard_screen_distance,
+            "points": [[x, y, point] for x, y, point in calibration_data],
+        }
+
+    def save_calibration(self, file_path, calibration_data):
+        with open(file_path, 'w') as f:
+            json.dump(self.calibration_dict(calibration_data), f, indent=2)
+
+    def load_calibration(self, file_path):
+        with open(file_path) as f:
+            return self.apply_calibration(json.load(f))
+
+    def apply_calibration(self, calibration):
+        self.standard_distance_centers = calibration["standard_distance_centers"]
+        self.standard_screen_distance = calibration["standard_screen_distance"]
+        return [(x, y, point) for x, y, point in calibration["points"]]
+
     def calculate_eye_to_screen_distance(self, eye_center_left, eye_center_right, standard_distance_centers, standard_screen_distance):
         new_centers_distance = np.linalg.norm(np.array(eye_center_left) - np.array(eye_center_right))
         new_distance = (standard_distance_centers / new_centers_distance) * standard_screen_distance
@@ -154,70 +272,275 @@ class EyeTracker:
         else:
             return None
 
-    def start_tracking(self, calibration_data):
-        while True:
-            _, frame = self.cap.read()
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            faces = self.detector(gray)
-            eyes_detected = False
+    def start_tracking(self, calibration_data, pipelined=False, gaze_log_path=None, on_capture=None, on_frame=None, show_window=True):
+        """Track until ESC or request_stop(). With ``gaze_log_path`` samples are appended to that binary
+        log as they arrive instead of being kept in ``gaze_data``.
 
-            for face in faces:
-                landmarks = self.predictor(gray, face)
-                left_eye_region = self.get_eye_region(landmarks, [36, 37, 38, 39, 40, 41])
-                right_eye_region = self.get_eye_region(landmarks, [42, 43, 44, 45, 46, 47])
-                
-                left_iris_position = self.get_iris_position(left_eye_region, frame, gray)
-                right_iris_position = self.get_iris_position(right_eye_region, frame, gray)
-
-                if left_iris_position and right_iris_position:
-                    avg_iris_position_x = (left_iris_position[0] + right_iris_position[0]) / 2
-                    avg_iris_position_y = (left_iris_position[1] + right_iris_position[1]) / 2
-                    
-                    left_eye_center = self.midpoint(left_eye_region[0], left_eye_region[3])
-                    right_eye_center = self.midpoint(right_eye_region[0], right_eye_region[3])
-                    avg_eye_center_x = (left_eye_center[0] + right_eye_center[0]) / 2
-                    avg_eye_center_y = (left_eye_center[1] + right_eye_center[1]) / 2
-                    
-                    new_distance = self.calculate_eye_to_screen_distance(left_eye_center, right_eye_center, self.standard_distance_centers, self.standard_screen_distance)
-                    screen_position = self.map_to_screen((avg_iris_position_x, avg_iris_position_y), (avg_eye_center_x, avg_eye_center_y), new_distance)
-                    
-                    screen_position_int = (int(screen_position[0]), int(screen_position[1]))
-                    cv2.circle(frame, left_iris_position, 2, (0, 255, 0), -1)
-                    cv2.circle(frame, right_iris_position, 2, (0, 255, 0), -1)
-                    cv2.putText(frame, f"Gaze: {screen_position_int}", (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 0, 0), 2)
-                    
-                    is_inside = self.check_screen_position(calibration_data, screen_position_int)
-                    if is_inside:
-                        self.gaze_data.append({"timestamp": time.time()-self.start_time, "screen_x": screen_position_int[0], "screen_y": screen_position_int[1]})
-                        cv2.circle(frame, screen_position_int, 5, (255, 0, 0), -1)
-                    else:
-                        fixed_point = self.check_calibration_points(calibration_data, screen_position_int)
-                        if fixed_point:
-                            self.gaze_data.append({"timestamp": time.time()-self.start_time, "fixed_point": fixed_point})
-                            cv2.putText(frame, f"Looking at: {fixed_point}", (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-                    eyes_detected = True
-
-            if not eyes_detected:
-                if self.missing_eye_start_time is None:
-                    self.missing_eye_start_time = time.time()
-                elif time.time() - self.missing_eye_start_time >= 3:
-                    cv2.putText(frame, "LOOK AT THE ROAD", (10, 120), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
-                    if time.time() - self.missing_eye_start_time >= 5:
-                        playsound(self.alert_sound_path)
+        ``on_capture(frame)`` sees every raw frame and ``on_frame(frame, gazes, timestamp)`` every
+        analyzed, annotated one, both on the tracking thread. With ``show_window=False`` no OpenCV
+        window is opened, so tracking can run on a thread other than the GUI's.
+        """
+        self.on_capture = on_capture
+        self.on_frame = on_frame
+        self.show_window = show_window
+        # Each tracking run is one session: gaze data and timestamps start from zero
+        self.gaze_data = []
+        self.engagement = EngagementScorer()
+        self.start_time = time.time()
+        self.gaze_log_path = gaze_log_path
+        if gaze_log_path is not None:
+            self.gaze_log = GazeLogWriter(gaze_log_path, self.start_time)
+        self.start_capture()
+        try:
+            if pipelined:
+                self.track_pipelined(calibration_data)
             else:
-                self.missing_eye_start_time = None
-            
+                self.track(calibration_data)
+        finally:
+            self.capture_stats_summary = self.capture_stats()
+            self.stop_capture()
+            if self.gaze_log is not None:
+                self.gaze_log.close()
+                self.gaze_log = None
+
+    def estimate_gaze(self, frame, gray, landmarks):
+        """Return ``(left_iris, right_iris, screen_position)`` for one face, or None if an iris is not found."""
+        left_eye_region = self.get_eye_region(landmarks, LEFT_EYE)
+        right_eye_region = self.get_eye_region(landmarks, RIGHT_EYE)
+
+        start = self.profiler.start()
+        left_iris_position = self.get_iris_position(left_eye_region, frame, gray)
+        right_iris_position = self.get_iris_position(right_eye_region, frame, gray)
+        self.profiler.record("iris", start)
+        if not (left_iris_position and right_iris_position):
+            return None
+
+        start = self.profiler.start()
+
+        avg_iris_position_x = (left_iris_position[0] + right_iris_position[0]) / 2
+        avg_iris_position_y = (left_iris_position[1] + right_iris_position[1]) / 2
+
+        left_eye_center = self.midpoint(left_eye_region[0], left_eye_region[3])
+        right_eye_center = self.midpoint(right_eye_region[0], right_eye_region[3])
+        avg_eye_center_x = (left_eye_center[0] + right_eye_center[0]) / 2
+        avg_eye_center_y = (left_eye_center[1] + right_eye_center[1]) / 2
+
+        new_distance = self.calculate_eye_to_screen_distance(left_eye_center, right_eye_center, self.standard_distance_centers, self.standard_screen_distance)
+        screen_position = self.map_to_screen((avg_iris_position_x, avg_iris_position_y), (avg_eye_center_x, avg_eye_center_y), new_distance)
+        self.profiler.record("mapping", start)
+        return left_iris_position, right_iris_position, screen_position
+
+    def classify_gaze(self, calibration_data, screen_position):
+        """Return ROAD_ZONE inside the calibrated screen area, the closest fixed point name, or None."""
+        if self.check_screen_position(calibration_data, screen_position):
+            return ROAD_ZONE
+        return self.check_calibration_points(calibration_data, screen_position)
+
+    def detect_faces(self, gray):
+        start = self.profiler.start()
+        faces = self.face_tracker.detect(gray)
+        self.profiler.record("detection", start)
+        return faces
+
+    def predict_landmarks(self, gray, faces):
+        start = self.profiler.start()
+        landmarks_list = []
+        for face in faces:
+            landmarks = shape_to_array(self.predictor(gray, face))
+            self.face_tracker.update(landmarks)
+            landmarks_list.append(landmarks)
+        self.profiler.record("landmarks", start)
+        return landmarks_list
+
+    def estimate_gazes(self, frame, gray, landmarks_list):
+        estimates = []
+        for landmarks in landmarks_list:
+            gaze = self.estimate_gaze(frame, gray, landmarks)
+            if gaze:
+                estimates.append(gaze)
+        return estimates
+
+    def classify_gazes(self, calibration_data, estimates):
+        start = self.profiler.start()
+        gazes = []
+        for left_iris_position, right_iris_position, screen_position in estimates:
+            screen_position_int = (int(screen_position[0]), int(screen_position[1]))
+            gazes.append({
+                "left_iris": left_iris_position,
+                "right_iris": right_iris_position,
+                "screen_position": screen_position_int,
+                "zone": self.classify_gaze(calibration_data, screen_position_int),
+            })
+        self.profiler.record("classification", start)
+        return gazes
+
+    def analyze_frame(self, frame, calibration_data):
+        """Detect, estimate and classify the gaze of every face in ``frame`` without drawing on it."""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        faces = self.detect_faces(gray)
+        landmarks_list = self.predict_landmarks(gray, faces)
+        estimates = self.estimate_gazes(frame, gray, landmarks_list)
+        return self.classify_gazes(calibration_data, estimates)
+
+    def request_stop(self):
+        """Make calibrate() and the tracking loop return; safe to call from any thread."""
+        self.stop_event.set()
+
+    def track(self, calibration_data):
+        while not self.stop_event.is_set():
+            ret, frame = self.read_frame()
+            if not ret:
+                continue
+            if self.on_capture is not None:
+                self.on_capture(frame)
+            timestamp = time.time() - self.start_time
+            gazes = self.analyze_frame(frame, calibration_data)
+            if self.render(frame, gazes, timestamp) == 27:
+                break
+
+    def track_pipelined(self, calibration_data):
+        # Analysis stages run on worker threads; drawing and imshow stay on this thread
+        pipeline = GazePipeline(self, calibration_data)
+        pipeline.start()
+        try:
+            while not self.stop_event.is_set():
+                ret, frame = self.read_frame()
+                if ret and self.on_capture is not None:
+                    self.on_capture(frame)
+                if ret:
+                    # The ring buffer slot is reused by the capture thread, so in-flight frames need their own copy
+                    pipeline.submit(frame.copy(), time.time() - self.start_time)
+                packet = pipeline.result(timeout=0.001)
+                if packet is None:
+                    continue
+                if self.render(packet.frame, packet.gazes, packet.timestamp) == 27:
+                    break
+        finally:
+            pipeline.stop()
+            self.pipeline_stats_summary = pipeline.stats()
+
+    def render(self, frame, gazes, timestamp):
+        """Process, draw and show one analyzed frame; returns the key pressed."""
+        start = self.profiler.start()
+        self.process_results(frame, gazes, timestamp)
+        self.profiler.draw_overlay(frame)
+        if self.on_frame is not None:
+            self.on_frame(frame, gazes, timestamp)
+        key = -1
+        if self.show_window:
             cv2.imshow("Frame", frame)
             key = cv2.waitKey(1)
-            if key == 27:
-                break
+        self.profiler.record("render", start)
+        self.profiler.frame_done()
+        return key
+
+    def process_results(self, frame, gazes, timestamp):
+        """Record the frame's gazes, draw them and raise the missing-eyes alert."""
+        eyes_detected = bool(gazes)
+        self.frame_samples = []
+
+        for gaze in gazes:
+            screen_position_int = gaze["screen_position"]
+            cv2.circle(frame, gaze["left_iris"], 2, (0, 255, 0), -1)
+            cv2.circle(frame, gaze["right_iris"], 2, (0, 255, 0), -1)
+            cv2.putText(frame, f"Gaze: {screen_position_int}", (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 0, 0), 2)
+
+            if gaze["zone"] == ROAD_ZONE:
+                self.record_gaze(timestamp, screen_position_int[0], screen_position_int[1], ZONE_ROAD)
+                cv2.circle(frame, screen_position_int, 5, (255, 0, 0), -1)
+            elif gaze["zone"]:
+                fixed_point = gaze["zone"]
+                self.record_gaze(timestamp, None, None, zone_code(fixed_point))
+                cv2.putText(frame, f"Looking at: {fixed_point}", (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+            else:
+                self.record_gaze(timestamp, screen_position_int[0], screen_position_int[1], ZONE_OFF_ROAD)
+
+        if not eyes_detected:
+            alert = self.missing_eye_start_time is not None and time.time() - self.missing_eye_start_time >= 3
+            self.record_gaze(timestamp, None, None, ZONE_NONE, FLAG_ALERT if alert else 0)
+            if self.missing_eye_start_time is None:
+                self.missing_eye_start_time = time.time()
+            elif alert:
+                cv2.putText(frame, "LOOK AT THE ROAD", (10, 120), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+                missing = time.time() - self.missing_eye_start_time
+                if missing >= 5:
+                    # Non-blocking: the frame loop keeps running while the sound plays
+                    self.alerts.trigger(ALERT_CRITICAL if missing >= 10 else ALERT_WARNING)
+        else:
+            if self.missing_eye_start_time is not None:
+                self.alerts.cancel()
+            self.missing_eye_start_time = None
+
+    def record_gaze(self, timestamp, screen_x, screen_y, zone, flags=0):
+        self.engagement.update(timestamp, zone)
+        self.frame_samples.append((timestamp, screen_x, screen_y, zone))
+        if self.gaze_log is not None:
+            self.gaze_log.append(timestamp, screen_x, screen_y, zone, flags)
+        elif zone == ZONE_ROAD:
+            self.gaze_data.append({"timestamp": timestamp, "screen_x": screen_x, "screen_y": screen_y})
+        elif zone != ZONE_NONE:
+            # The in-memory list only keeps gazes; frames without eyes are logged to the binary log only
+            self.gaze_data.append({"timestamp": timestamp, "fixed_point": zone_name(zone)})
+
+    def gaze_columns(self):
+        """Typed ``timestamp``/``screen_x``/``screen_y``/``zone`` columns of the last run.
+
+        Memory-mapped views of the binary log when the run had one, otherwise built from ``gaze_data``.
+        """
+        if self.gaze_log_path is not None:
+            return GazeLogReader(self.gaze_log_path).columns()
+        timestamps, screen_x, screen_y, zones = [], [], [], []
+        for sample in self.gaze_data:
+            timestamps.append(sample["timestamp"])
+            screen_x.append(sample.get("screen_x", np.nan))
+            screen_y.append(sample.get("screen_y", np.nan))
+            zones.append(zone_code(sample["fixed_point"]) if "fixed_point" in sample else ZONE_ROAD)
+        return {
+            "timestamp": np.array(timestamps, dtype=np.float64),
+            "screen_x": np.array(screen_x, dtype=np.float32),
+            "screen_y": np.array(screen_y, dtype=np.float32),
+            "zone": np.array(zones, dtype=np.uint8),
+        }
+
+    def gaze_samples(self):
+        """``(timestamp, screen_x, screen_y, zone)`` tuples of the recorded gaze data for Database.log_gaze_samples."""
+        columns = self.gaze_columns()
+        return list(zip(columns["timestamp"].tolist(), columns["screen_x"].tolist(),
+                        columns["screen_y"].tolist(), columns["zone"].tolist()))
 
     def save_gaze_data(self, file_path):
-        gaze_df = pd.DataFrame(self.gaze_data)
+        """Export the last run to ``file_path``: columnar .parquet/.npz, or the legacy sparse .csv."""
+        if not file_path.endswith('.csv'):
+            export_columns(file_path, self.gaze_columns())
+            return
+        os.makedirs(os.path.dirname(file_path) or '.', exist_ok=True)
+        columns = self.gaze_columns()
+        # Road samples carry coordinates, fixed points a name
+        gazed = columns["zone"] != ZONE_NONE
+        road = columns["zone"][gazed] == ZONE_ROAD
+        gaze_df = pd.DataFrame({
+            "timestamp": columns["timestamp"][gazed],
+            "screen_x": columns["screen_x"][gazed],
+            "screen_y": columns["screen_y"][gazed],
+            "fixed_point": [None if is_road else zone_name(code) for is_road, code in zip(road, columns["zone"][gazed])],
+        })
         gaze_df.to_csv(file_path, index=False)
 
+    def eyes_missing_for(self):
+        """Seconds since the eyes were last found, 0 while they are visible."""
+        if self.missing_eye_start_time is None:
+            return 0.0
+        return time.time() - self.missing_eye_start_time
+
     def stop_tracking(self):
         self.tracking = False
+        self.request_stop()
+        self.stop_capture()
+        self.alerts.close()  # The tracker is done with its camera; its alert thread goes too
+        if self.profiler.enabled:
+            print(self.profiler.report())
+            stats = self.detection_stats()
+            print("face detection: " + ", ".join(f"{name}={count}" for name, count in stats.items()))
         if self.cap is not None:
             self.cap.release()
         cv2.destroyAllWindows()
@@ -0,0 +1,118 @@
+# src/core/gaze_log.py
+# Append-only log of fixed-size gaze records, written during tracking and read back through a memory map.
+import os
+import struct
+
+import numpy as np
+
+from core.zones import ZONE_ROAD
+
+MAGIC = b'GAZELOG1'
+HEADER = struct.Struct('<8sd')  # magic, session start (Unix time)
+
+# timestamp (seconds since session start), screen_x, screen_y, zone code, flags, 2 bytes padding
+RECORD = struct.Struct('<dffBB2x')
+RECORD_DTYPE = np.dtype({
+    'names': ['timestamp', 'screen_x', 'screen_y', 'zone', 'flags'],
+    'formats': ['<f8', '<f4', '<f4', 'u1', 'u1'],
+    'offsets': [0, 8, 12, 16, 17],
+    'itemsize': RECORD.size,
+})
+
+FLAG_ALERT = 1  # The missing-eyes warning was showing when the sample was taken
+
+NAN = float('nan')
+
+
+def session_log_path(session_id):
+    """Where the live UI logs a session; the report reads it while the session is still running."""
+    return f"data/sessions/session_{session_id}.gazelog"
+
+
+class GazeLogWriter:
+    """Appends one record per gaze sample.
+
+    Records are flushed to the OS every ``flush_every`` samples, so an application crash loses at
+    most that many. Reopening an existing log appends to it after dropping a partially written record.
+    """
+
+    def __init__(self, file_path, start_time, flush_every=30):
+        self.file_path = file_path
+        self.flush_every = flush_every
+        self.pending = 0
+        self.count = 0
+        os.makedirs(os.path.dirname(file_path) or '.', exist_ok=True)
+        if os.path.exists(file_path) and os.path.getsize(file_path) >= HEADER.size:
+            self.file = open(file_path, 'r+b')
+            magic, self.start_time = HEADER.unpack(self.file.read(HEADER.size))
+            if magic != MAGIC:
+                self.file.close()
+                raise ValueError(f"{file_path} is not a gaze log")
+            self.count = (os.path.getsize(file_path) - HEADER.size) // RECORD.size
+            self.file.truncate(HEADER.size + self.count * RECORD.size)
+            self.file.seek(0, os.SEEK_END)
+        else:
+            self.file = open(file_path, 'wb')
+            self.start_time = start_time
+            self.file.write(HEADER.pack(MAGIC, start_time))
+
+    def append(self, timestamp, screen_x, screen_y, zone, flags=0):
+        # None coordinates (fixed-point zones, no gaze) are stored as NaN
+        self.file.write(RECORD.pack(timestamp, NAN if screen_x is None else screen_x,
+                                    NAN if screen_y is None else screen_y, zone, flags))
+        self.count += 1
+        self.pending += 1
+        if self.pending >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        self.file.flush()
+        self.pending = 0
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+
+class GazeLogReader:
+    """Memory-mapped view of a gaze log; columns are NumPy views into the file, nothing is parsed.
+
+    The record count is fixed when the log is opened; call ``refresh`` to see records appended since.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        with open(file_path, 'rb') as f:
+            magic, self.start_time = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{file_path} is not a gaze log")
+        self.refresh()
+
+    def refresh(self):
+        # A trailing partial record (crash mid-write) is left out
+        count = (os.path.getsize(self.file_path) - HEADER.size) // RECORD.size
+        if count > 0:
+            self.records = np.memmap(self.file_path, dtype=RECORD_DTYPE, mode='r', offset=HEADER.size, shape=(count,))
+        else:
+            self.records = np.empty(0, dtype=RECORD_DTYPE)
+        return count
+
+    def __len__(self):
+        return len(self.records)
+
+    def columns(self, since=None, until=None):
+        """Return ``timestamp``, ``screen_x``, ``screen_y``, ``zone`` and ``flags`` views, optionally limited to a time range."""
+        records = self.records
+        if since is not None or until is not None:
+            # Timestamps only grow, so the range is a slice found by binary search
+            timestamps = records['timestamp']
+            start = np.searchsorted(timestamps, since, side='left') if since is not None else 0
+            end = np.searchsorted(timestamps, until, side='right') if until is not None else len(records)
+            records = records[start:end]
+        return {name: records[name] for name in RECORD_DTYPE.names}
+
+    def road_points(self):
+        """``(screen_x, screen_y)`` of the road samples, for the gaze heatmap."""
+        road = self.records['zone'] == ZONE_ROAD
+        return self.records['screen_x'][road], self.records['screen_y'][road]
@@ -0,0 +1,13 @@
+# src/core/landmarks.py
+import numpy as np
+
+# Slices into the (68, 2) landmark array of dlib's 68-point model
+JAW = slice(0, 17)
+LEFT_EYE = slice(36, 42)
+RIGHT_EYE = slice(42, 48)
+EYES = slice(36, 48)
+
+
+def shape_to_array(shape):
+    """Convert a ``dlib.full_object_detection`` to an ``(n, 2)`` int32 array of (x, y) points."""
+    return np.array([(point.x, point.y) for point in shape.parts()], dtype=np.int32)
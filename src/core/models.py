@@ -0,0 +1,60 @@
+# src/core/models.py
+# Process-wide dlib models: each one is loaded on first use and shared by every tracker after that.
+import logging
+import os
+import threading
+import time
+
+import dlib
+
+DEFAULT_PREDICTOR_PATH = "src/models/shape_predictor_68_face_landmarks_GTX.dat"
+
+
+class ModelRegistry:
+    """Loads the face detector and the landmark predictors once per process.
+
+    The first caller pays for the load; concurrent first callers wait on the lock instead of loading
+    the same file twice. Predictors are keyed by absolute path. ``load_times`` records how long each
+    load took, in seconds. Worker processes (batch_analysis) each get their own registry.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.models = {}
+        self.load_times = {}
+
+    def get(self, key, loader):
+        model = self.models.get(key)
+        if model is not None:
+            return model
+        with self.lock:
+            if key not in self.models:
+                start = time.perf_counter()
+                self.models[key] = loader()
+                self.load_times[key] = time.perf_counter() - start
+                logging.info(f"Loaded {key} in {self.load_times[key]:.2f}s")
+            return self.models[key]
+
+    def detector(self):
+        return self.get("frontal_face_detector", dlib.get_frontal_face_detector)
+
+    def predictor(self, predictor_path=DEFAULT_PREDICTOR_PATH):
+        predictor_path = os.path.abspath(predictor_path)
+        if not os.path.isfile(predictor_path):
+            # dlib's own error for a missing file does not name it
+            raise FileNotFoundError(f"Shape predictor not found: {predictor_path}")
+        return self.get(predictor_path, lambda: dlib.shape_predictor(predictor_path))
+
+    def stats(self):
+        return {"loaded": list(self.models), "load_times": dict(self.load_times)}
+
+
+registry = ModelRegistry()
+
+
+def get_detector():
+    return registry.detector()
+
+
+def get_predictor(predictor_path=DEFAULT_PREDICTOR_PATH):
+    return registry.predictor(predictor_path)
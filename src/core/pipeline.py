@@ -0,0 +1,146 @@
+# src/core/pipeline.py
+import logging
+import queue
+import threading
+import time
+
+import cv2
+
+from core.profiling import RollingStats
+
+
+class FramePacket:
+    """A frame travelling through the pipeline together with every stage's output."""
+
+    __slots__ = ("sequence", "frame", "timestamp", "gray", "faces", "landmarks", "estimates", "gazes")
+
+    def __init__(self, sequence, frame, timestamp):
+        self.sequence = sequence
+        self.frame = frame
+        self.timestamp = timestamp
+        self.gray = None
+        self.faces = None
+        self.landmarks = None
+        self.estimates = None
+        self.gazes = None
+
+
+class Stage(threading.Thread):
+    """Applies ``function`` to each packet from ``input_queue`` and forwards it to ``output_queue``.
+
+    ``None`` is the shutdown sentinel and is passed downstream before the stage exits.
+    """
+
+    def __init__(self, name, function, input_queue, output_queue):
+        super().__init__(name=f"pipeline-{name}", daemon=True)
+        self.stage_name = name
+        self.function = function
+        self.input_queue = input_queue
+        self.output_queue = output_queue
+        self.latency = RollingStats()
+        self.errors = 0
+
+    def run(self):
+        while True:
+            packet = self.input_queue.get()
+            if packet is None:
+                self.output_queue.put(None)
+                break
+            start = time.perf_counter()
+            try:
+                self.function(packet)
+            except Exception:
+                # Drop the frame but keep the stage alive so the pipeline can still shut down
+                self.errors += 1
+                logging.exception(f"Pipeline stage {self.stage_name} failed on frame {packet.sequence}")
+                continue
+            self.latency.record(time.perf_counter() - start)
+            self.output_queue.put(packet)
+
+    def stats(self):
+        stats = self.latency.summary()
+        stats["queue_depth"] = self.input_queue.qsize()
+        stats["errors"] = self.errors
+        return stats
+
+
+class GazePipeline:
+    """Detect -> landmark -> iris -> classify stages, each on its own thread with bounded queues between them.
+
+    Results come out in sequence order since every stage is a single FIFO worker.
+    ``submit`` never blocks: when the first queue is full the frame is dropped,
+    matching the capture buffer's latest-frame-wins policy. Only the detect stage
+    calls ``FaceTracker.detect``; the landmark stage feeds it seeds for the next
+    frame, which at worst makes it fall back to an ROI search.
+    """
+
+    def __init__(self, tracker, calibration_data, queue_size=2):
+        self.tracker = tracker
+        self.calibration_data = calibration_data
+        self.sequence = 0
+        self.frames_dropped = 0
+        functions = [
+            ("detect", self.detect),
+            ("landmarks", self.landmarks),
+            ("iris", self.iris),
+            ("classify", self.classify),
+        ]
+        queues = [queue.Queue(maxsize=queue_size) for _ in range(len(functions) + 1)]
+        self.input_queue = queues[0]
+        self.output_queue = queues[-1]
+        self.stages = [Stage(name, function, queues[i], queues[i + 1]) for i, (name, function) in enumerate(functions)]
+
+    def detect(self, packet):
+        packet.gray = cv2.cvtColor(packet.frame, cv2.COLOR_BGR2GRAY)
+        packet.faces = self.tracker.detect_faces(packet.gray)
+
+    def landmarks(self, packet):
+        packet.landmarks = self.tracker.predict_landmarks(packet.gray, packet.faces)
+
+    def iris(self, packet):
+        packet.estimates = self.tracker.estimate_gazes(packet.frame, packet.gray, packet.landmarks)
+
+    def classify(self, packet):
+        packet.gazes = self.tracker.classify_gazes(self.calibration_data, packet.estimates)
+
+    def start(self):
+        for stage in self.stages:
+            stage.start()
+
+    def submit(self, frame, timestamp):
+        packet = FramePacket(self.sequence, frame, timestamp)
+        try:
+            self.input_queue.put_nowait(packet)
+        except queue.Full:
+            self.frames_dropped += 1
+            return False
+        self.sequence += 1
+        return True
+
+    def result(self, timeout=None):
+        """Return the next finished packet, or None if none is ready within ``timeout``."""
+        try:
+            return self.output_queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def stop(self):
+        # Drain finished packets so every stage can forward the sentinel and exit
+        self.put_sentinel()
+        while any(stage.is_alive() for stage in self.stages):
+            self.result(timeout=0.05)
+
+    def put_sentinel(self):
+        while True:
+            try:
+                self.input_queue.put(None, timeout=0.05)
+                return
+            except queue.Full:
+                self.result(timeout=0)
+
+    def stats(self):
+        stats = {stage.stage_name: stage.stats() for stage in self.stages}
+        stats["output"] = {"queue_depth": self.output_queue.qsize()}
+        stats["frames_submitted"] = self.sequence
+        stats["frames_dropped"] = self.frames_dropped
+        return stats
@@ -1,14 +1,17 @@
 # src/core/pos_calibration.py
 import cv2
-import dlib
 import time
+import numpy as np
+from core.face_tracking import detect_faces
+from core.landmarks import shape_to_array
+from core.models import get_detector, get_predictor
 
 # Initialize the camera
 cap = cv2.VideoCapture(0)
 
 # Load Dlib's face detector and shape predictor
-detector = dlib.get_frontal_face_detector()
-predictor = dlib.shape_predictor("src/models/shape_predictor_68_face_landmarks_GTX.dat")
+detector = get_detector()
+predictor = get_predictor()
 
 # Define the desired range for the important features (e.g., eyes, nose, mouth)
 min_eye_distance = 40
@@ -16,20 +19,20 @@ max_eye_distance = 100
 min_face_size = 100
 max_face_size = 300
 
-def get_face_landmarks(gray, detector, predictor):
-    faces = detector(gray)
+# Fraction of the camera resolution the face detector runs at (landmarks stay full resolution)
+detection_scale = 1.0
+
+def get_face_landmarks(gray, detector, predictor, scale=1.0):
+    faces = detect_faces(detector, gray, scale)
     for face in faces:
-        landmarks = predictor(gray, face)
-        return landmarks
+        return shape_to_array(predictor(gray, face))
     return None
 
 def check_position(landmarks):
-    if landmarks:
-        left_eye = landmarks.part(36)
-        right_eye = landmarks.part(45)
-        eye_distance = ((left_eye.x - right_eye.x) ** 2 + (left_eye.y - right_eye.y) ** 2) ** 0.5
+    if landmarks is not None:
+        eye_distance = np.linalg.norm(landmarks[36] - landmarks[45])
 
-        face_width = landmarks.part(16).x - landmarks.part(0).x
+        face_width = landmarks[16, 0] - landmarks[0, 0]
 
         if min_eye_distance < eye_distance < max_eye_distance and min_face_size < face_width < max_face_size:
             return "Good"
@@ -59,7 +62,7 @@ def perform_calibration():
             break
 
         gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        landmarks = get_face_landmarks(gray, detector, predictor)
+        landmarks = get_face_landmarks(gray, detector, predictor, detection_scale)
         position = check_position(landmarks)
 
         if position == "Good":
@@ -80,10 +83,8 @@ def perform_calibration():
             cv2.putText(frame, "Bad Position", (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
             cv2.rectangle(frame, (0, 0), (frame.shape[1], frame.shape[0]), (0, 0, 255), 5)
 
-        if landmarks:
-            for n in range(0, 68):
-                x = landmarks.part(n).x
-                y = landmarks.part(n).y
+        if landmarks is not None:
+            for x, y in landmarks.tolist():
                 cv2.circle(frame, (x, y), 1, (255, 255, 255), -1)
 
         cv2.imshow("Calibration", frame)
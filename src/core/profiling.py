@@ -0,0 +1,104 @@
+# src/core/profiling.py
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+# Per-frame stages of the tracker, in pipeline order
+STAGES = ("capture", "detection", "landmarks", "iris", "mapping", "classification", "db_write", "render")
+
+
+class RollingStats:
+    """Rolling window of durations with percentile summaries."""
+
+    def __init__(self, window=300):
+        self.durations = deque(maxlen=window)
+        self.count = 0
+
+    def record(self, seconds):
+        self.durations.append(seconds)
+        self.count += 1
+
+    def summary(self):
+        if not self.durations:
+            return {"count": self.count}
+        durations = np.array(self.durations) * 1000
+        p50, p95, p99 = np.percentile(durations, [50, 95, 99])
+        return {
+            "count": self.count,
+            "mean_ms": float(durations.mean()),
+            "p50_ms": float(p50),
+            "p95_ms": float(p95),
+            "p99_ms": float(p99),
+            "max_ms": float(durations.max()),
+        }
+
+
+class Profiler:
+    """Per-stage timings and FPS for the tracking loop.
+
+    Callers take ``start = profiler.start()`` and later call ``profiler.record(stage, start)``.
+    When disabled both are a single attribute check, so the hooks can stay in the hot loop.
+    """
+
+    def __init__(self, enabled=False, show_overlay=False, window=300, overlay_interval=0.5):
+        self.enabled = enabled
+        self.show_overlay = enabled and show_overlay
+        self.stages = {stage: RollingStats(window) for stage in STAGES}
+        self.frame_times = deque(maxlen=window)
+        self.overlay_interval = overlay_interval
+        self.overlay_lines = []
+        self.overlay_updated = 0.0
+
+    def start(self):
+        if not self.enabled:
+            return 0.0
+        return time.perf_counter()
+
+    def record(self, stage, start):
+        if not self.enabled:
+            return
+        self.stages[stage].record(time.perf_counter() - start)
+
+    def frame_done(self):
+        if not self.enabled:
+            return
+        self.frame_times.append(time.perf_counter())
+
+    def fps(self):
+        if len(self.frame_times) < 2:
+            return 0.0
+        elapsed = self.frame_times[-1] - self.frame_times[0]
+        return (len(self.frame_times) - 1) / elapsed if elapsed > 0 else 0.0
+
+    def summary(self):
+        summary = {stage: stats.summary() for stage, stats in self.stages.items()}
+        summary["fps"] = self.fps()
+        return summary
+
+    def report(self):
+        lines = [f"Tracker profile ({self.fps():.1f} FPS)"]
+        for stage, stats in self.stages.items():
+            summary = stats.summary()
+            if "mean_ms" in summary:
+                lines.append(f"  {stage:<15} n={summary['count']:<7} p50={summary['p50_ms']:7.2f}ms "
+                             f"p95={summary['p95_ms']:7.2f}ms p99={summary['p99_ms']:7.2f}ms")
+        return "\n".join(lines)
+
+    def draw_overlay(self, frame):
+        if not self.show_overlay:
+            return
+        # Percentiles are recomputed a few times a second, not on every frame
+        now = time.perf_counter()
+        if now - self.overlay_updated >= self.overlay_interval:
+            self.overlay_updated = now
+            self.overlay_lines = [f"FPS {self.fps():.1f}"]
+            for stage, stats in self.stages.items():
+                summary = stats.summary()
+                if "mean_ms" in summary:
+                    self.overlay_lines.append(f"{stage} p50 {summary['p50_ms']:.1f} p95 {summary['p95_ms']:.1f} p99 {summary['p99_ms']:.1f} ms")
+        y = frame.shape[0] - 10 - 18 * (len(self.overlay_lines) - 1)
+        for line in self.overlay_lines:
+            cv2.putText(frame, line, (10, y), cv2.FONT_HERSHEY_SIMPLEX, 0.45, (255, 255, 255), 1)
+            y += 18
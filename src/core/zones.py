@@ -0,0 +1,34 @@
+# src/core/zones.py
+# Small integer codes for gaze zones, shared by the database, exports and scoring.
+
+ZONE_NONE = 0  # No gaze estimated (eyes not found)
+ZONE_ROAD = 1
+ZONE_LEFT_MIRROR = 2
+ZONE_RIGHT_MIRROR = 3
+ZONE_REAR_MIRROR = 4
+ZONE_DASHBOARD = 5
+ZONE_OFF_ROAD = 6  # Gaze estimated but outside every calibrated zone
+
+# Names match the calibration points and EyeTracker.classify_gaze results
+ZONE_NAMES = {
+    ZONE_NONE: '',
+    ZONE_ROAD: 'Road',
+    ZONE_LEFT_MIRROR: 'Left Mirror',
+    ZONE_RIGHT_MIRROR: 'Right Mirror',
+    ZONE_REAR_MIRROR: 'Rear Mirror',
+    ZONE_DASHBOARD: 'Dashboard',
+    ZONE_OFF_ROAD: 'Off Road',
+}
+
+ZONE_CODES = {name: code for code, name in ZONE_NAMES.items()}
+
+
+def zone_code(zone):
+    """Code for a ``classify_gaze`` result; None (no zone matched) is ZONE_OFF_ROAD."""
+    if zone is None:
+        return ZONE_OFF_ROAD
+    return ZONE_CODES.get(zone, ZONE_OFF_ROAD)
+
+
+def zone_name(code):
+    return ZONE_NAMES.get(int(code), '')
@@ -1,15 +1,18 @@
 import cv2
-import dlib
 import numpy as np
-import pandas as pd
+import sys
 import time
 import matplotlib.pyplot as plt
 import seaborn as sns
+from core.face_tracking import detect_faces
+from core.models import get_detector, get_predictor
+from core.zones import ZONE_ROAD
+from utils.gaze_export import export_columns, export_extension, load_road_points
 
 # Load the predictor and the face detector
-predictor_path = "src/models/shape_predictor_68_face_landmarks_GTX.dat"
-detector = dlib.get_frontal_face_detector()
-predictor = dlib.shape_predictor(predictor_path)
+detector = get_detector()
+predictor = get_predictor()
+detection_scale = 1.0  # Run the face detector on a downscaled copy of each frame
 
 def midpoint(point1, point2):
     return (int((point1[0] + point2[0]) / 2), int((point1[1] + point2[1]) / 2))
@@ -61,7 +64,7 @@ def get_eye_to_eye_distance():
     while True:
         _, frame = cap.read()
         gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        faces = detector(gray)
+        faces = detect_faces(detector, gray, detection_scale)
         
         for face in faces:
             landmarks = predictor(gray, face)
@@ -96,7 +99,7 @@ def calibrate(calibration_points, detector, predictor):
         while True:
             _, frame = cap.read()
             gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            faces = detector(gray)
+            faces = detect_faces(detector, gray, detection_scale)
             cv2.putText(frame, f"Look at point: {point}", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 0, 0), 2)
             cv2.imshow("Calibration", frame)
             key = cv2.waitKey(1)
@@ -177,7 +180,7 @@ gaze_data = []
 while True:
     _, frame = cap.read()
     gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    faces = detector(gray)
+    faces = detect_faces(detector, gray, detection_scale)
 
     for face in faces:
         landmarks = predictor(gray, face)
@@ -221,13 +224,20 @@ while True:
 cap.release()
 cv2.destroyAllWindows()
 
-# Save gaze data to a CSV file
-gaze_df = pd.DataFrame(gaze_data)
-gaze_df.to_csv("data/gaze_data.csv", index=False)
-
-# Plot heatmap
+# Save gaze data as typed columns (Parquet, or .npz without pyarrow)
+gaze_columns = {
+    "timestamp": np.array([sample["timestamp"] for sample in gaze_data], dtype=np.float64),
+    "screen_x": np.array([sample["screen_x"] for sample in gaze_data], dtype=np.float32),
+    "screen_y": np.array([sample["screen_y"] for sample in gaze_data], dtype=np.float32),
+    "zone": np.full(len(gaze_data), ZONE_ROAD, dtype=np.uint8),
+}
+export_path = "data/gaze_data" + export_extension()
+export_columns(export_path, gaze_columns)
+
+# Plot heatmap of this run, plus any exported sessions or .gazelog files given on the command line
+screen_x, screen_y = load_road_points([export_path] + sys.argv[1:])
 plt.figure(figsize=(10, 6))
-sns.kdeplot(x=gaze_df['screen_x'], y=gaze_df['screen_y'], cmap="Reds", shade=True, bw_adjust=0.5)
+sns.kdeplot(x=screen_x, y=screen_y, cmap="Reds", shade=True, bw_adjust=0.5)
 plt.title("Gaze Heatmap")
 plt.xlabel("Screen X")
 plt.ylabel("Screen Y")
@@ -1,8 +1,9 @@
 import wx
-from ui.main_ui import LoginFrame
+from ui.main_ui import LoginFrame, stop_report_server
 
 if __name__ == "__main__":
     app = wx.App(False)
     login = LoginFrame(None, "Login")
     login.Show()
     app.MainLoop()
+    stop_report_server()
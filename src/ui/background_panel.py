@@ -2,23 +2,58 @@
 import wx
 
 class BackgroundPanel(wx.Panel):
-    def __init__(self, parent, image_path):
+    # Decoded images by path, shared by every panel (LoginFrame and MainFrame use the same logo)
+    images = {}
+
+    def __init__(self, parent, image_path, resize_delay=100):
         super().__init__(parent)
         self.image_path = image_path
+        if image_path not in BackgroundPanel.images:
+            BackgroundPanel.images[image_path] = wx.Image(image_path, wx.BITMAP_TYPE_PNG)
+        self.image = BackgroundPanel.images[image_path]
+        self.bitmap = None  # self.image scaled to bitmap_size
+        self.bitmap_size = None
+        self.resize_delay = resize_delay  # ms without size events before rescaling
+        self.resize_timer = wx.Timer(self)
         self.Bind(wx.EVT_PAINT, self.on_paint)
         self.Bind(wx.EVT_SIZE, self.on_size)
+        self.Bind(wx.EVT_TIMER, self.on_resize_done, self.resize_timer)
+        self.Bind(wx.EVT_WINDOW_DESTROY, self.on_destroy)
 
     def on_paint(self, event):
         dc = wx.PaintDC(self)
         self.draw_background(dc)
 
     def on_size(self, event):
-        self.Refresh()  # Repaint on resize
+        # Drag-resizing sends a stream of size events; rescale once they stop
+        self.resize_timer.StartOnce(self.resize_delay)
         event.Skip()
 
+    def on_resize_done(self, event):
+        width, height = self.GetClientSize()
+        if (width, height) != self.bitmap_size and width > 0 and height > 0:
+            self.rescale(width, height)
+            self.Refresh(eraseBackground=False)
+
+    def on_destroy(self, event):
+        if event.GetEventObject() is self:
+            self.resize_timer.Stop()
+        event.Skip()
+
+    def rescale(self, width, height):
+        self.bitmap = wx.Bitmap(self.image.Scale(width, height))
+        self.bitmap_size = (width, height)
+
     def draw_background(self, dc):
-        client_size = self.GetClientSize()
-        image = wx.Image(self.image_path, wx.BITMAP_TYPE_PNG)
-        image = image.Scale(client_size.GetWidth(), client_size.GetHeight())
-        bitmap = wx.Bitmap(image)
-        dc.DrawBitmap(bitmap, 0, 0)
\ No newline at end of file
+        width, height = self.GetClientSize()
+        if width <= 0 or height <= 0:
+            return
+        if self.bitmap is None:
+            self.rescale(width, height)
+        if self.bitmap_size == (width, height):
+            dc.DrawBitmap(self.bitmap, 0, 0)
+        else:
+            # Mid-resize: stretch the cached bitmap until the debounced rescale replaces it
+            memory_dc = wx.MemoryDC(self.bitmap)
+            dc.StretchBlit(0, 0, width, height, memory_dc, 0, 0, self.bitmap_size[0], self.bitmap_size[1])
+            memory_dc.SelectObject(wx.NullBitmap)
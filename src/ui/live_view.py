@@ -0,0 +1,54 @@
+# src/ui/live_view.py
+import wx
+
+class LiveView(wx.Panel):
+    """Live camera preview that reuses one wx.Bitmap.
+
+    ``show_frame`` copies an RGB frame into the bitmap in place with ``CopyFromBuffer`` and repaints
+    only the frame's rectangle. It shows every frame it is given: the producer (TrackingWorker) owns
+    the rate limit and the BGR to RGB conversion.
+    """
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.SetBackgroundStyle(wx.BG_STYLE_PAINT)  # on_paint covers the whole panel
+        self.frame_size = None  # (width, height) of self.bitmap
+        self.bitmap = None
+        self.frames_shown = 0
+        self.Bind(wx.EVT_PAINT, self.on_paint)
+        self.Bind(wx.EVT_SIZE, self.on_size)
+
+    def show_frame(self, rgb_frame):
+        """Show a contiguous ``(height, width, 3)`` RGB uint8 frame; the caller may reuse it on return."""
+        height, width = rgb_frame.shape[:2]
+        if self.frame_size != (width, height):
+            # Reallocated only when the camera resolution changes
+            self.frame_size = (width, height)
+            self.bitmap = wx.Bitmap(width, height, 24)
+            self.Refresh(eraseBackground=False)
+        self.bitmap.CopyFromBuffer(rgb_frame, wx.BitmapBufferFormat_RGB)
+        self.RefreshRect(self.frame_rect(), eraseBackground=False)
+        self.frames_shown += 1
+
+    def frame_rect(self):
+        # The frame is drawn unscaled, centred in the panel
+        width, height = self.GetClientSize()
+        frame_width, frame_height = self.frame_size
+        return wx.Rect(max(0, (width - frame_width) // 2), max(0, (height - frame_height) // 2), frame_width, frame_height)
+
+    def on_size(self, event):
+        self.Refresh(eraseBackground=False)
+        event.Skip()
+
+    def on_paint(self, event):
+        dc = wx.PaintDC(self)
+        if self.bitmap is None:
+            dc.SetBackground(wx.Brush(self.GetBackgroundColour()))
+            dc.Clear()
+            return
+        rect = self.frame_rect()
+        # A frame update only invalidates the frame itself; clear the margins for anything larger
+        if not rect.Contains(self.GetUpdateRegion().GetBox()):
+            dc.SetBackground(wx.Brush(self.GetBackgroundColour()))
+            dc.Clear()
+        dc.DrawBitmap(self.bitmap, rect.x, rect.y)
@@ -1,19 +1,67 @@
 import wx
 import wx.media
-import cv2
 import os
-import datetime
 from core.gaze_detection import EyeTracker
+from core.models import DEFAULT_PREDICTOR_PATH
 from core.pos_callibartion import perform_calibration
-from core.engagement_score import calculate_engagement_score
 from utils.database import Database
+from utils.db_connection import DB_PATH
 from utils.user_database import UserDatabase
 from ui.background_panel import BackgroundPanel
+from ui.live_view import LiveView
+from ui.tracking_worker import TrackingWorker, recording_path
+import datetime
 import logging
+import socket
 import subprocess
+import time
+import urllib.parse
+import webbrowser
 
 logging.basicConfig(level=logging.DEBUG)
 
+REPORT_PORT = 8501
+REPORT_STARTUP_TIMEOUT = 30.0  # seconds to wait for a new report server to accept connections
+report_server = None  # Streamlit process shared by every MainFrame, across logout/login
+
+def report_server_running():
+    try:
+        with socket.create_connection(('localhost', REPORT_PORT), timeout=0.2):
+            return True
+    except OSError:
+        return False
+
+def start_report_server(streamlit_app_path):
+    global report_server
+    if report_server is None or report_server.poll() is not None:
+        # Bound to localhost: only this machine's browser needs the report
+        report_server = subprocess.Popen(['streamlit', 'run', streamlit_app_path, '--server.port', str(REPORT_PORT),
+                                          '--server.address', 'localhost', '--server.headless', 'true',
+                                          '--', '--db', os.path.abspath(DB_PATH)])
+    return report_server
+
+def stop_report_server():
+    """Terminate the report server if this process started it; called once the app exits."""
+    global report_server
+    if report_server is not None and report_server.poll() is None:
+        report_server.terminate()
+        try:
+            report_server.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            report_server.kill()
+    report_server = None
+
+def open_when_ready(url, deadline, interval=250):
+    # Polled from the wx event loop so the UI stays responsive while Streamlit starts
+    if report_server_running():
+        webbrowser.open(url)
+    elif report_server is None or report_server.poll() is not None:
+        wx.MessageBox('The report server exited before it started listening', 'Error', wx.OK | wx.ICON_ERROR)
+    elif time.monotonic() > deadline:
+        wx.MessageBox(f"The report server did not start within {REPORT_STARTUP_TIMEOUT:.0f} seconds", 'Error', wx.OK | wx.ICON_ERROR)
+    else:
+        wx.CallLater(interval, open_when_ready, url, deadline, interval)
+
 class RegistrationDialog(wx.Dialog):
     def __init__(self, parent):
         super(RegistrationDialog, self).__init__(parent, title="Register", size=(400, 400))
@@ -155,8 +203,9 @@ class MainFrame(wx.Frame):
         self.panel = BackgroundPanel(self, "data/fiulogo.png")
 
         # Initialize video recording variables
-        self.video_writer = None
         self.video_file = None
+        self.video_frame = None
+        self.tracking_worker = None
 
         # Create top button panel
         top_button_panel = wx.Panel(self.panel, style=wx.TRANSPARENT_WINDOW)
@@ -211,12 +260,10 @@ class MainFrame(wx.Frame):
         self.settings_panel.Hide()
 
         self.panel.SetSizerAndFit(self.sizer)
-        self.predictor_path = "src/models/shape_predictor_68_face_landmarks_GTX.dat"
+        self.predictor_path = DEFAULT_PREDICTOR_PATH
 
         self.eye_tracking = EyeTracker(self.predictor_path)
         self.db = Database()
-        self.timer = wx.Timer(self)
-        self.Bind(wx.EVT_TIMER, self.update_frame, self.timer)
         self.Bind(wx.EVT_CLOSE, self.on_close)  # Bind the close event
 
     def create_home_panel(self):
@@ -313,6 +360,20 @@ class MainFrame(wx.Frame):
         self.change_password_button.Bind(wx.EVT_BUTTON, self.change_password)
         vbox.Add(self.change_password_button, flag=wx.ALL, border=10)
 
+        sessions_label = wx.StaticText(panel, label="Recorded sessions:")
+        sessions_label.SetFont(font)
+        vbox.Add(sessions_label, flag=wx.LEFT | wx.RIGHT | wx.TOP, border=10)
+        self.session_list = wx.ListBox(panel, size=(300, 100))
+        vbox.Add(self.session_list, flag=wx.ALL, border=10)
+        self.session_ids = []  # Session id of each session_list item
+
+        self.delete_session_button = wx.Button(panel, label="Delete Session")
+        self.delete_session_button.SetFont(font)
+        self.delete_session_button.SetBackgroundColour("#FF0000")  # Red
+        self.delete_session_button.SetForegroundColour(wx.WHITE)
+        self.delete_session_button.Bind(wx.EVT_BUTTON, self.delete_session)
+        vbox.Add(self.delete_session_button, flag=wx.ALL, border=10)
+
         self.delete_profile_button = wx.Button(panel, label="Delete Profile")
         self.delete_profile_button.SetFont(font)
         self.delete_profile_button.SetBackgroundColour("#FF0000")  # Red
@@ -369,12 +430,21 @@ class MainFrame(wx.Frame):
             video_player.Show()
 
     def generate_report(self, event):
+        # A fresh token per link; the report looks the user up from it, never from a name in the URL
+        token = self.user_db.create_report_token(self.username)
+        url = f"http://localhost:{REPORT_PORT}/?token={urllib.parse.quote(token)}"
+        # A server that is already up (ours or one started by hand) is reused; its caches stay warm
+        if report_server_running():
+            webbrowser.open(url)
+            return
+
         # Get the absolute path of the current directory
         current_dir = os.path.dirname(os.path.abspath(__file__))
         streamlit_app_path = os.path.join(current_dir, 'streamlit_app.py')
     
         if os.path.exists(streamlit_app_path):
-            subprocess.Popen(['streamlit', 'run', streamlit_app_path])
+            start_report_server(streamlit_app_path)
+            open_when_ready(url, time.monotonic() + REPORT_STARTUP_TIMEOUT)
         else:
             wx.MessageBox(f"Error: File does not exist: {streamlit_app_path}", 'Error', wx.OK | wx.ICON_ERROR)
 
@@ -438,6 +508,7 @@ class MainFrame(wx.Frame):
         self.panel.Layout()
 
     def show_profile(self, event):
+        self.update_session_list()
         self.home_panel.Hide()
         self.report_panel.Hide()
         self.settings_panel.Hide()
@@ -470,94 +541,111 @@ class MainFrame(wx.Frame):
     def delete_profile(self, event):
         dlg = wx.MessageDialog(self, 'Are you sure you want to delete your profile?', 'Confirm Delete', wx.YES_NO | wx.NO_DEFAULT | wx.ICON_WARNING)
         if dlg.ShowModal() == wx.ID_YES:
+            self.db.writer.flush()  # Rows still queued for this user would outlive the delete
             self.user_db.delete_user(self.username)
             wx.MessageBox('Profile deleted successfully', 'Info', wx.OK | wx.ICON_INFORMATION)
             self.logout(event)
         dlg.Destroy()
 
+    def update_session_list(self):
+        sessions = self.db.list_sessions(self.username)
+        self.session_ids = [session_id for session_id, _, _, _, _ in sessions]
+        self.session_list.SetItems([
+            f"Session {session_id}: {datetime.datetime.fromtimestamp(started_at):%Y-%m-%d %H:%M}" + ("" if ended_at else " (in progress)")
+            if started_at else f"Session {session_id}"
+            for session_id, started_at, ended_at, _, _ in sessions
+        ])
+
+    def delete_session(self, event):
+        selection = self.session_list.GetSelection()
+        if selection == wx.NOT_FOUND:
+            return
+        session_id = self.session_ids[selection]
+        if self.tracking_worker is not None and self.tracking_worker.session_id == session_id:
+            wx.MessageBox('Stop the live feed before deleting the session it is recording', 'Error', wx.OK | wx.ICON_ERROR)
+            return
+        dlg = wx.MessageDialog(self, f'Delete session {session_id} and its gaze data?', 'Confirm Delete', wx.YES_NO | wx.NO_DEFAULT | wx.ICON_WARNING)
+        if dlg.ShowModal() == wx.ID_YES:
+            self.db.delete_session(session_id)
+            self.update_session_list()
+        dlg.Destroy()
+
     def start_live_feed(self, event):
         selected_camera_index = self.camera_choice.GetSelection()
         self.live_feed_button.Disable()
         self.stop_feed_button.Enable()
-        calibration_points = ['Top-Left', 'Top-Right', 'Bottom-Left', 'Bottom-Right', 'Left Mirror', 'Right Mirror', 'Rear Mirror', 'Dashboard']
-        calibration_data = self.eye_tracking.calibrate(calibration_points)
-        self.eye_tracking.start_tracking(calibration_data)
-        self.eye_tracking.save_gaze_data("data/gaze_data.csv")
 
-        self.timer.Start(1000 // 30)  # Update frame 30 times per second
+        self.video_frame = VideoFrame(self, "Live Feed")
+        self.video_frame.Bind(wx.EVT_CLOSE, self.on_video_frame_close)
+        self.video_frame.capture_button.Bind(wx.EVT_BUTTON, self.on_capture_point)
+        self.video_frame.Show()
 
-        # Start recording video
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.video_file = f"recording_{timestamp}.avi"
-        fourcc = cv2.VideoWriter_fourcc(*'XVID')
-        self.video_writer = cv2.VideoWriter(self.video_file, fourcc, 20.0, (640, 480))  # Adjust resolution as needed
+        # Calibration, tracking and recording run on the worker; results come back through on_tracking_update
+        self.video_file = recording_path()
+        self.tracking_worker = TrackingWorker(self, self.eye_tracking, self.username, selected_camera_index, record_path=self.video_file)
+        self.tracking_worker.start()
 
     def stop_live_feed(self, event):
-        self.timer.Stop()
-        self.eye_tracking.stop_tracking()
-        self.live_feed_button.Enable()
+        if self.tracking_worker is not None:
+            self.tracking_worker.stop()  # on_tracking_finished re-enables the start button once the session is saved
         self.stop_feed_button.Disable()
 
-        # Stop recording video
-        if self.video_writer:
-            self.video_writer.release()
-            self.video_writer = None
-
-        # Update the video files list in the report section
-        self.update_video_files()
+        if self.video_frame:
+            video_frame, self.video_frame = self.video_frame, None
+            video_frame.Destroy()
 
     def on_video_frame_close(self, event):
+        self.video_frame = None  # The frame is closing itself; stop_live_feed must not destroy it too
         self.stop_live_feed(event)  # Call stop_live_feed when video frame is closed
         event.Skip()  # Ensure the default close event is still processed
 
-    def update_frame(self, event):
-        ret, frame = self.eye_tracking.cap.read()
-        if ret:
-            height, width = frame.shape[:2]
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            bitmap = wx.Bitmap.FromBuffer(width, height, frame_rgb)
-
-            # Save frame to video file
-            if self.video_writer:
-                self.video_writer.write(frame)
-
-            gaze_data = self.eye_tracking.gaze_data(frame)
-            if gaze_data:
-                logging.debug(f"Gaze data: {gaze_data}")
-                flattened_gaze_data = self.flatten_gaze_data(gaze_data)
-                logging.debug(f"Flattened gaze data: {flattened_gaze_data}")
-                self.db.log_gaze_data(self.username, {'gaze_direction': flattened_gaze_data})
-                engagement_percentage = calculate_engagement_score(gaze_data)
-                print(f"Engagement Percentage: {engagement_percentage:.2f}%")
+    def on_tracking_update(self, update):
+        if self.video_frame:
+            self.video_frame.video_display.show_frame(update["frame"])
+            if update.get("calibrating"):
+                self.video_frame.show_calibration_point(update["calibration_point"])
+            else:
+                self.video_frame.end_calibration()
+        if "score" in update:
+            logging.debug(f"Zone: {update['zone']}, engagement: {update['score']:.2f}%")
+
+    def on_capture_point(self, event):
+        if self.tracking_worker is not None:
+            self.tracking_worker.capture_point()
+
+    def on_tracking_finished(self, error):
+        self.tracking_worker = None
+        self.live_feed_button.Enable()
+        self.stop_feed_button.Disable()
+        if self.video_frame:
+            video_frame, self.video_frame = self.video_frame, None
+            video_frame.Destroy()
+        if error is not None:
+            wx.MessageBox(f"Eye-tracking stopped: {error}", 'Error', wx.OK | wx.ICON_ERROR)
+
+        # Update the video files list in the report section
+        self.update_video_files()
+        self.update_session_list()
 
     def logout(self, event):
         self.Close()
         login_frame = LoginFrame(None, "Login")
         login_frame.Show()
 
-    def flatten_gaze_data(self, data):
-        flat_data = []
-        if isinstance(data, list):
-            return data
-        try:
-            for key in data:
-                if isinstance(data[key], list):
-                    flat_data.extend([float(x) for x in data[key]])
-                else:
-                    flat_data.append(float(data[key]))
-        except TypeError as e:
-            logging.error(f"Error flattening data: {e}")
-        return flat_data
-
     def update_video_files(self):
         video_files = self.get_video_files()
         self.video_choice.SetItems(video_files)
 
     def on_close(self, event):
-        # Close video writer if still open
-        if self.video_writer:
-            self.video_writer.release()
-            self.video_writer = None
+        # Let a running session save before the tracker and its camera go away
+        if self.tracking_worker is not None:
+            self.tracking_worker.stop()
+            self.tracking_worker.join(timeout=10.0)
+        self.eye_tracking.stop_tracking()
+        self.db.close()
+        # Report links opened from this login stop working once it ends
+        self.user_db.revoke_report_tokens(self.username)
+        self.user_db.close()
 
         # Delete recorded video files
         for video_file in self.get_video_files():
@@ -571,10 +659,40 @@ class VideoFrame(wx.Frame):
     def __init__(self, parent, title):
         super(VideoFrame, self).__init__(parent, title=title, size=(800, 600))
         self.panel = wx.Panel(self)
-        self.video_display = wx.StaticBitmap(self.panel)
+        self.video_display = LiveView(self.panel)
+        # Calibration controls, shown until the last point is captured
+        self.calibration_label = wx.StaticText(self.panel, label="Starting the camera...")
+        self.capture_button = wx.Button(self.panel, label="Capture (C)")
+        calibration_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        calibration_sizer.Add(self.calibration_label, 1, wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 10)
+        calibration_sizer.Add(self.capture_button, 0)
         sizer = wx.BoxSizer(wx.VERTICAL)
         sizer.Add(self.video_display, 1, wx.EXPAND | wx.ALL, 5)
+        sizer.Add(calibration_sizer, 0, wx.EXPAND | wx.ALL, 5)
         self.panel.SetSizer(sizer)
+        self.calibrating = True
+        self.Bind(wx.EVT_CHAR_HOOK, self.on_key)
+
+    def show_calibration_point(self, point):
+        # point is None while the eye distance is measured
+        if point is None:
+            self.calibration_label.SetLabel("Stand around 50 cm from the camera, then press Capture")
+        else:
+            self.calibration_label.SetLabel(f"Look at point: {point}, then press Capture")
+
+    def end_calibration(self):
+        if self.calibrating:
+            self.calibrating = False
+            self.calibration_label.Hide()
+            self.capture_button.Hide()
+            self.panel.Layout()
+
+    def on_key(self, event):
+        # 'c' confirms a calibration step, as it does in the OpenCV window
+        if self.calibrating and event.GetKeyCode() in (ord('C'), ord('c')):
+            wx.PostEvent(self.capture_button, wx.CommandEvent(wx.wxEVT_BUTTON, self.capture_button.GetId()))
+        else:
+            event.Skip()
 
 class VideoPlayer(wx.Frame):
     def __init__(self, parent, video_file):
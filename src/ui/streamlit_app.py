@@ -1,31 +1,148 @@
+import argparse
+import datetime
+import os
+import sys
+
+import matplotlib.pyplot as plt
+import numpy as np
 import streamlit as st
-import random
 
-# Function to generate fake user engagement score
-def generate_user_engagement_score():
-    return round(random.uniform(76.0, 96.0), 2)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from core.engagement_score import score_session
+from core.gaze_log import GazeLogReader, session_log_path
+from core.zones import ZONE_ROAD
+from utils.database import fetch_gaze_samples, fetch_sessions
+from utils.db_connection import DB_PATH, connect
+from utils.user_database import report_token_user
+
+HEATMAP_BINS = 64
+
+def parse_args():
+    # streamlit run streamlit_app.py -- --db data/engagement_data.db
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", default=DB_PATH)
+    args, _ = parser.parse_known_args()
+    return args
+
+def report_user(db_path, token):
+    # Not cached: a token revoked at logout must stop working on the next rerun
+    connection = connect(db_path, read_only=True)
+    try:
+        return report_token_user(connection, token)
+    finally:
+        connection.close()
+
+@st.cache_data(ttl=5)
+def load_sessions(db_path, username):
+    # A short TTL so sessions recorded while the report is open show up
+    connection = connect(db_path, read_only=True)
+    try:
+        return fetch_sessions(connection, username)
+    finally:
+        connection.close()
+
+@st.cache_data(max_entries=64)
+def session_report(db_path, session_id, cache_key, log_path=None):
+    """Scores, zone dwell and heatmap of one session.
+
+    Cached per ``(session_id, cache_key)``; see ``session_source``. A finished session is read and
+    aggregated once. A session in progress is read from its gaze log (``log_path``): the memory map has
+    every sample up to the last flush and needs no query against a table that is still being written.
+    """
+    if log_path is not None:
+        reader = GazeLogReader(log_path)
+        columns = reader.columns()
+        screen_x, screen_y = reader.road_points()
+    else:
+        connection = connect(db_path, read_only=True)
+        try:
+            columns = fetch_gaze_samples(connection, session_id)
+        finally:
+            connection.close()
+        road = columns["zone"] == ZONE_ROAD
+        screen_x, screen_y = columns["screen_x"][road], columns["screen_y"][road]
+    report = score_session(columns["timestamp"], columns["zone"])
+    located = ~np.isnan(screen_x)
+    if located.any():
+        heatmap, x_edges, y_edges = np.histogram2d(screen_x[located], screen_y[located], bins=HEATMAP_BINS)
+        report["heatmap"] = (heatmap.T, (x_edges[0], x_edges[-1], y_edges[-1], y_edges[0]))
+    else:
+        report["heatmap"] = None
+    report["samples"] = len(columns["zone"])
+    report["duration"] = float(columns["timestamp"][-1]) if len(columns["timestamp"]) else 0.0
+    return report
+
+def session_source(session):
+    """``(cache_key, log_path)`` of a session for ``session_report``.
+
+    A finished session is keyed by its end time and read from the database. One in progress is read
+    from its gaze log and keyed by the log's size, so it gets a new cache entry only when samples have
+    been appended, not on every rerun.
+    """
+    session_id, _, ended_at, _, _ = session
+    log_path = session_log_path(session_id)
+    if ended_at or not os.path.exists(log_path):
+        return ended_at, None
+    return os.path.getsize(log_path), log_path
+
+def session_label(session):
+    session_id, started_at, ended_at, camera_index, _ = session
+    started = datetime.datetime.fromtimestamp(started_at).strftime('%Y-%m-%d %H:%M') if started_at else 'unknown start'
+    status = '' if ended_at else ' (in progress)'
+    return f"Session {session_id}: {started}{status}"
 
 # Function to explain how the score is calculated
 def explain_engagement_score():
     st.write("""
     ### How the score is calculated
     The user engagement score is calculated based on several criteria related to the driver's gaze:
-    
+
     - **Road Focus**: Time spent focusing on the road is considered positive.
     - **Mirror Check**: Time spent checking mirrors is considered positive if within a threshold.
     - **Dashboard Check**: Time spent checking the dashboard is considered positive if within a threshold.
     - **Off Road Gaze**: Time spent looking away from the road is considered negative.
     - **Prolonged Check**: Prolonged checks are considered negative if exceeding a threshold.
     - **Closed Eyes**: Time spent with eyes closed is always negative.
-    
+
     Each gaze direction is scored, and the overall engagement score is calculated as a percentage.
     """)
 
+args = parse_args()
+token = st.query_params.get("token")
+username = report_user(args.db, token) if token else None
+
 st.title("Driver Monitoring Report")
 
+if not username:
+    st.warning("This report link is missing or has expired. Open the report from the app's Report tab to see your sessions.")
+    st.stop()
+
+sessions = load_sessions(args.db, username)
+if not sessions:
+    st.info(f"No recorded sessions for {username} yet.")
+    st.stop()
+
+session = st.selectbox("Session", sessions, format_func=session_label)
+report = session_report(args.db, session[0], *session_source(session))
+
 st.header("User Engagement Score")
-score = generate_user_engagement_score()
-st.write(f"**Score:** {score}")
+st.write(f"**Score:** {report['score']:.2f}%")
+st.caption(f"{report['samples']} gaze samples over {report['duration'] / 60:.1f} minutes")
 
 if st.button("How the score is calculated"):
-    explain_engagement_score()
\ No newline at end of file
+    explain_engagement_score()
+
+st.header("Where the driver looked")
+st.bar_chart({zone: seconds for zone, seconds in report["zone_dwell"].items() if seconds > 0})
+
+st.header("Road gaze heatmap")
+if report["heatmap"] is None:
+    st.write("No road gaze recorded in this session.")
+else:
+    heatmap, extent = report["heatmap"]
+    figure, axes = plt.subplots(figsize=(10, 6))
+    axes.imshow(heatmap, extent=extent, cmap="Reds", aspect="auto")
+    axes.set_xlabel("Screen X")
+    axes.set_ylabel("Screen Y")
+    st.pyplot(figure)
+    plt.close(figure)
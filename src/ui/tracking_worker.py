@@ -0,0 +1,180 @@
+# src/ui/tracking_worker.py
+import datetime
+import logging
+import threading
+import time
+
+import cv2
+import numpy as np
+import wx
+
+from core.gaze_log import session_log_path
+from utils.database import Database
+from utils.gaze_export import session_gaze_path
+
+PREVIEW_BUFFERS = 2  # RGB preview buffers: one the UI is showing, one being filled
+
+CALIBRATION_POINTS = ['Top-Left', 'Top-Right', 'Bottom-Left', 'Bottom-Right', 'Left Mirror', 'Right Mirror', 'Rear Mirror', 'Dashboard']
+
+def recording_path():
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    return f"recording_{timestamp}.avi"
+
+class TrackingWorker(threading.Thread):
+    """Runs one live session (calibration, tracking, saving) with the window's EyeTracker, off the wx main thread.
+
+    Updates are posted to ``window.on_tracking_update`` with wx.CallAfter at most ``update_fps`` times a
+    second; this is the preview's only rate limit. Only the newest update is kept while one is waiting,
+    so a busy UI never queues a backlog. ``update["frame"]`` is RGB, converted straight from the tracker's
+    frame into one of ``PREVIEW_BUFFERS`` reused buffers, which goes back to the pool once the UI has shown it.
+    During calibration the updates carry ``calibrating`` and ``calibration_point`` (None while the eye
+    distance is measured) and the UI confirms each step with ``capture_point``; no OpenCV window is
+    opened on this thread. ``window.on_tracking_finished`` is called once the session is saved.
+    """
+
+    def __init__(self, window, eye_tracking, username, camera_index, update_fps=15, record_path=None):
+        super().__init__(name="tracking", daemon=True)
+        self.window = window
+        self.eye_tracking = eye_tracking
+        self.username = username
+        self.camera_index = camera_index
+        self.min_interval = 1.0 / update_fps
+        self.record_path = record_path
+        self.video_writer = None
+        self.session_id = None
+        self.db = None
+        self.lock = threading.Lock()
+        self.latest = None
+        self.last_post = 0.0
+        self.free_buffers = []
+        self.buffer_count = 0
+
+    def stop(self):
+        """Ask the session to end; returns immediately, on_tracking_finished follows."""
+        self.eye_tracking.request_stop()
+
+    def capture_point(self):
+        """Confirm the current calibration step (the eye distance, then each calibration point)."""
+        self.eye_tracking.request_capture()
+
+    def run(self):
+        error = None
+        db = self.db = Database()  # Own connection: sqlite3 connections stay on the thread that opened them
+        self.eye_tracking.stop_event.clear()
+        try:
+            calibration_data = self.eye_tracking.calibrate(CALIBRATION_POINTS, on_calibration_frame=self.on_calibration_frame,
+                                                           show_window=False)
+            if self.eye_tracking.stop_event.is_set():
+                return
+            self.eye_tracking.save_calibration("data/calibration.json", calibration_data)  # Reused by batch_analysis
+            calibration_id = db.save_calibration(self.username, self.eye_tracking.calibration_dict(calibration_data))
+            self.session_id = db.start_session(self.username, self.camera_index, calibration_id)
+
+            if self.record_path:
+                fourcc = cv2.VideoWriter_fourcc(*'XVID')
+                self.video_writer = cv2.VideoWriter(self.record_path, fourcc, 20.0, (640, 480))  # Adjust resolution as needed
+            try:
+                self.eye_tracking.start_tracking(calibration_data, gaze_log_path=session_log_path(self.session_id),
+                                                 on_capture=self.on_capture, on_frame=self.on_frame, show_window=False)
+            finally:
+                if self.video_writer:
+                    self.video_writer.release()
+                    self.video_writer = None
+
+            self.eye_tracking.save_gaze_data(session_gaze_path(self.session_id))
+            db.end_session(self.session_id)
+        except Exception as e:
+            logging.exception("Tracking session failed")
+            error = e
+        finally:
+            self.db = None
+            db.close()
+            wx.CallAfter(self.finished, error)
+
+    def on_capture(self, frame):
+        if self.video_writer:
+            self.video_writer.write(frame)
+
+    def due(self):
+        now = time.perf_counter()
+        if now - self.last_post < self.min_interval:
+            return False
+        self.last_post = now
+        return True
+
+    def preview_frame(self, frame):
+        """``frame`` converted to RGB in a pooled buffer, or None while the UI still holds every buffer."""
+        height, width = frame.shape[:2]
+        buffer = None
+        with self.lock:
+            while self.free_buffers and buffer is None:
+                buffer = self.free_buffers.pop()
+                if buffer.shape[:2] != (height, width):
+                    buffer = None  # From before a resolution change
+                    self.buffer_count -= 1
+            if buffer is None:
+                if self.buffer_count >= PREVIEW_BUFFERS:
+                    return None
+                self.buffer_count += 1
+        if buffer is None:
+            buffer = np.empty((height, width, 3), dtype=np.uint8)
+        # The conversion is the only pass over the frame; the tracker may reuse its buffer right after
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=buffer)
+        return buffer
+
+    def on_calibration_frame(self, frame, point):
+        if not self.due():
+            return
+        rgb_frame = self.preview_frame(frame)
+        if rgb_frame is not None:
+            self.post({"frame": rgb_frame, "calibrating": True, "calibration_point": point})
+
+    def on_frame(self, frame, gazes, timestamp):
+        self.log_samples(self.eye_tracking.frame_samples)
+        if not self.due():
+            return
+        rgb_frame = self.preview_frame(frame)
+        if rgb_frame is None:
+            return
+        self.post({
+            "frame": rgb_frame,
+            "gazes": gazes,
+            "timestamp": timestamp,
+            "zone": gazes[0]["zone"] if gazes else None,
+            "score": self.eye_tracking.engagement.score(),
+            "window_scores": self.eye_tracking.engagement.window_summary(),
+            "eyes_missing_for": self.eye_tracking.eyes_missing_for(),
+        })
+
+    def log_samples(self, samples):
+        # Every frame's samples as typed gaze_samples rows, not just the previewed frames; log_gaze_samples
+        # only queues them for the background writer, which end_session flushes
+        profiler = self.eye_tracking.profiler
+        start = profiler.start()
+        self.db.log_gaze_samples(self.session_id, samples)
+        profiler.record("db_write", start)
+
+    def post(self, update):
+        with self.lock:
+            replaced, self.latest = self.latest, update
+            if replaced is not None:
+                # Superseded before the UI saw it; its buffer is free again
+                self.free_buffers.append(replaced["frame"])
+        if replaced is None:
+            wx.CallAfter(self.deliver)
+
+    def deliver(self):
+        with self.lock:
+            update, self.latest = self.latest, None
+        if update is None:
+            return
+        try:
+            if self.window:
+                self.window.on_tracking_update(update)
+        finally:
+            with self.lock:
+                self.free_buffers.append(update["frame"])
+
+    def finished(self, error):
+        if self.window:
+            self.window.on_tracking_finished(error)
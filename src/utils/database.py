@@ -1,54 +1,297 @@
 import sqlite3
 import hashlib
-import os
+import json
+import logging
+import math
+import queue
+import threading
 import time
+import numpy as np
+from utils.db_connection import DB_PATH, connect
+from utils.gaze_export import remove_session_files
+from utils.migrations import migrate
+
+INSERT_GAZE_SQL = '''
+    INSERT INTO gaze_data (user, timestamp, gaze_direction, session_id)
+    VALUES (?, ?, ?, ?)
+'''
+
+INSERT_SAMPLE_SQL = '''
+    INSERT INTO gaze_samples (session_id, timestamp, screen_x, screen_y, zone)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+# Column dtypes of export_gaze_samples / import_gaze_samples
+SAMPLE_DTYPES = {
+    "timestamp": np.float64,
+    "screen_x": np.float32,
+    "screen_y": np.float32,
+    "zone": np.uint8,
+}
+
+def fetch_sessions(connection, username):
+    """``(id, started_at, ended_at, camera_index, calibration_id)`` rows of a user's sessions, newest first."""
+    cursor = connection.execute('''
+        SELECT sessions.id, started_at, ended_at, camera_index, calibration_id
+        FROM sessions JOIN users ON users.id = sessions.user_id
+        WHERE users.username = ?
+        ORDER BY started_at DESC
+    ''', (username,))
+    return cursor.fetchall()
+
+def fetch_gaze_samples(connection, session_id, since=None, until=None):
+    """Typed columns of one session's gaze_samples; works on read-only report connections too."""
+    query = 'SELECT timestamp, screen_x, screen_y, zone FROM gaze_samples WHERE session_id = ?'
+    params = [session_id]
+    if since is not None:
+        query += ' AND timestamp >= ?'
+        params.append(since)
+    if until is not None:
+        query += ' AND timestamp <= ?'
+        params.append(until)
+    query += ' ORDER BY timestamp, id'
+    rows = connection.execute(query, params).fetchall()
+    if not rows:
+        return {name: np.empty(0, dtype=dtype) for name, dtype in SAMPLE_DTYPES.items()}
+    # None (no coordinates) becomes NaN through the float conversion
+    table = np.array(rows, dtype=np.float64)
+    return {name: table[:, column].astype(dtype) for column, (name, dtype) in enumerate(SAMPLE_DTYPES.items())}
+
+class BackgroundWriter(threading.Thread):
+    """Writes queued rows on its own connection, batching them into one transaction.
+
+    Rows are flushed with ``executemany`` once ``batch_size`` rows are pending or
+    ``flush_interval`` seconds after the first pending row, whichever comes first.
+    A batch that fails is rolled back and retried row by row, so only the rows that fail on their
+    own are dropped; each one is logged and counted in ``stats()``. The thread keeps running.
+    """
+
+    def __init__(self, db_path, batch_size=200, flush_interval=0.5):
+        super().__init__(name="db-writer", daemon=True)
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.rows_queued = 0
+        self.rows_flushed = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.rows_failed = 0
+        self.flush_seconds_total = 0.0
+        self.flush_seconds_max = 0.0
+        self.start()
+
+    def submit(self, sql, rows):
+        with self.lock:
+            self.rows_queued += len(rows)
+        self.queue.put((sql, rows))
+
+    def flush(self, timeout=5.0):
+        """Block until everything submitted so far is committed."""
+        done = threading.Event()
+        self.queue.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        self.queue.put(None)
+        self.join()
+
+    def run(self):
+        connection = connect(self.db_path)
+        pending = {}
+        pending_rows = 0
+        deadline = None
+        while True:
+            timeout = max(0.0, deadline - time.monotonic()) if pending else None
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                # flush_interval elapsed since the first pending row
+                self.write(connection, pending)
+                pending, pending_rows = {}, 0
+                continue
+            if item is None or isinstance(item, threading.Event):
+                self.write(connection, pending)
+                pending, pending_rows = {}, 0
+                if item is None:
+                    break
+                item.set()
+                continue
+            sql, rows = item
+            if not pending:
+                deadline = time.monotonic() + self.flush_interval
+            pending.setdefault(sql, []).extend(rows)
+            pending_rows += len(rows)
+            if pending_rows >= self.batch_size:
+                self.write(connection, pending)
+                pending, pending_rows = {}, 0
+        connection.close()
+
+    def write(self, connection, pending):
+        if not pending:
+            return
+        row_count = sum(len(rows) for rows in pending.values())
+        start = time.perf_counter()
+        try:
+            with connection:  # One transaction for the whole batch, rolled back if any statement fails
+                for sql, rows in pending.items():
+                    connection.executemany(sql, rows)
+            rows_written = row_count
+        except sqlite3.Error as e:
+            logging.warning(f"Batch of {row_count} rows failed ({e}), retrying row by row")
+            with self.lock:
+                self.failed_flushes += 1
+            rows_written = self.write_rows(connection, pending)
+        elapsed = time.perf_counter() - start
+        with self.lock:
+            self.rows_flushed += rows_written
+            self.rows_failed += row_count - rows_written
+            self.flushes += 1
+            self.flush_seconds_total += elapsed
+            self.flush_seconds_max = max(self.flush_seconds_max, elapsed)
+
+    def write_rows(self, connection, pending):
+        # A failing statement only undoes itself, so the good rows still commit together
+        written = 0
+        try:
+            with connection:
+                for sql, rows in pending.items():
+                    for row in rows:
+                        try:
+                            connection.execute(sql, row)
+                            written += 1
+                        except sqlite3.Error as e:
+                            logging.error(f"Dropped row {row!r} for {sql.split('(')[0].strip()}: {e}")
+        except sqlite3.Error as e:
+            logging.error(f"Dropped the whole batch, the row by row retry could not commit: {e}")
+            return 0
+        return written
+
+    def stats(self):
+        with self.lock:
+            return {
+                "rows_queued": self.rows_queued,
+                "rows_flushed": self.rows_flushed,
+                "flushes": self.flushes,
+                "failed_flushes": self.failed_flushes,
+                "rows_failed": self.rows_failed,
+                "mean_flush_ms": 1000 * self.flush_seconds_total / self.flushes if self.flushes else 0.0,
+                "max_flush_ms": 1000 * self.flush_seconds_max,
+            }
 
 class Database:
-    def __init__(self):
-        db_path = 'data/engagement_data.db'
-        os.makedirs(os.path.dirname(db_path), exist_ok=True)  # Ensure the directory exists
-        self.connection = sqlite3.connect(db_path)
+    def __init__(self, db_path=DB_PATH):
+        self.db_path = db_path
+        self.connection = connect(db_path)
         self.create_tables()
+        self.writer = BackgroundWriter(db_path)
 
     def create_tables(self):
-        cursor = self.connection.cursor()
+        # Schema changes live in utils/migrations.py; this is a version check once the database is current
+        migrate(self.connection)
 
-        # Drop the table if it exists to avoid schema conflicts during testing
-        cursor.execute('DROP TABLE IF EXISTS gaze_data')
+    def start_session(self, username, camera_index=None, calibration_id=None):
+        """Open a session for ``username`` and return its id."""
+        with self.connection:
+            cursor = self.connection.execute('''
+                INSERT INTO sessions (user_id, started_at, camera_index, calibration_id)
+                VALUES ((SELECT id FROM users WHERE username = ?), ?, ?, ?)
+            ''', (username, time.time(), camera_index, calibration_id))
+        return cursor.lastrowid
 
-        # Table for gaze data
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS gaze_data (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user TEXT,
-                timestamp TEXT,
-                gaze_direction TEXT
-            )
-        ''')
-
-        # Table for user data
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE,
-                password_hash TEXT
-            )
-        ''')
-        self.connection.commit()
-
-    def log_gaze_data(self, username, gaze_data):
-        cursor = self.connection.cursor()
+    def end_session(self, session_id):
+        self.writer.flush()
+        with self.connection:
+            self.connection.execute('UPDATE sessions SET ended_at = ? WHERE id = ? AND ended_at IS NULL',
+                                    (time.time(), session_id))
+
+    def list_sessions(self, username):
+        """Return ``(id, started_at, ended_at, camera_index, calibration_id)`` rows, newest first."""
+        return fetch_sessions(self.connection, username)
+
+    def delete_session(self, session_id):
+        # gaze_samples and gaze_data rows of the session go with it (ON DELETE CASCADE), its files right after
+        self.writer.flush()
+        with self.connection:
+            self.connection.execute('DELETE FROM sessions WHERE id = ?', (session_id,))
+        remove_session_files(session_id)
+
+    def save_calibration(self, username, calibration):
+        """Store a calibration dict (as written by EyeTracker.save_calibration) and return its id."""
+        with self.connection:
+            cursor = self.connection.execute('''
+                INSERT INTO calibrations (user_id, created_at, data)
+                VALUES ((SELECT id FROM users WHERE username = ?), ?, ?)
+            ''', (username, time.time(), json.dumps(calibration)))
+        return cursor.lastrowid
+
+    def load_calibration(self, calibration_id):
+        result = self.connection.execute('SELECT data FROM calibrations WHERE id = ?', (calibration_id,)).fetchone()
+        return json.loads(result[0]) if result else None
+
+    def log_gaze_data(self, username, gaze_data, session_id=None):
+        # Queued for the background writer; nothing touches the database on the caller's thread
         timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
-        for gaze_direction in gaze_data.get('gaze_direction', []):
-            cursor.execute('''
-                INSERT INTO gaze_data (user, timestamp, gaze_direction) 
-                VALUES (?, ?, ?)
-            ''', (username, timestamp, str(gaze_direction)))
-        self.connection.commit()
+        rows = [(username, timestamp, str(gaze_direction), session_id) for gaze_direction in gaze_data.get('gaze_direction', [])]
+        if rows:
+            self.writer.submit(INSERT_GAZE_SQL, rows)
+
+    def log_gaze_samples(self, session_id, samples):
+        """Queue ``(timestamp, screen_x, screen_y, zone)`` samples, zone being a core.zones code."""
+        rows = [(session_id, float(timestamp), screen_x, screen_y, int(zone)) for timestamp, screen_x, screen_y, zone in samples]
+        if rows:
+            self.writer.submit(INSERT_SAMPLE_SQL, rows)
+
+    def export_gaze_samples(self, session_id, since=None, until=None):
+        """Return a session's samples as typed NumPy columns (see SAMPLE_DTYPES), ordered by timestamp.
+
+        Missing screen coordinates come back as NaN.
+        """
+        self.writer.flush()
+        return fetch_gaze_samples(self.connection, session_id, since, until)
+
+    def import_gaze_samples(self, session_id, columns):
+        """Insert typed columns (as returned by export_gaze_samples) in one transaction; returns the row count."""
+        self.writer.flush()
+        screen_x = np.asarray(columns["screen_x"], dtype=np.float64)
+        screen_y = np.asarray(columns["screen_y"], dtype=np.float64)
+        rows = zip(
+            [session_id] * len(screen_x),
+            np.asarray(columns["timestamp"], dtype=np.float64).tolist(),
+            [None if math.isnan(x) else x for x in screen_x.tolist()],
+            [None if math.isnan(y) else y for y in screen_y.tolist()],
+            np.asarray(columns["zone"], dtype=np.int64).tolist(),
+        )
+        with self.connection:
+            cursor = self.connection.executemany(INSERT_SAMPLE_SQL, rows)
+        return cursor.rowcount
+
+    def writer_stats(self):
+        return self.writer.stats()
 
-    def retrieve_gaze_data(self):
+    def retrieve_gaze_data(self, username=None, since=None, until=None, session_id=None):
+        # Filtering by user and a timestamp range is served by idx_gaze_data_user_timestamp,
+        # by session by idx_gaze_data_session
+        self.writer.flush()
+        query = 'SELECT user, timestamp, gaze_direction FROM gaze_data'
+        conditions, params = [], []
+        if session_id is not None:
+            conditions.append('session_id = ?')
+            params.append(session_id)
+        if username is not None:
+            conditions.append('user = ?')
+            params.append(username)
+        if since is not None:
+            conditions.append('timestamp >= ?')
+            params.append(since)
+        if until is not None:
+            conditions.append('timestamp <= ?')
+            params.append(until)
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
         cursor = self.connection.cursor()
-        cursor.execute('SELECT user, timestamp, gaze_direction FROM gaze_data')
+        cursor.execute(query, params)
         data = cursor.fetchall()
         return data
 
@@ -83,6 +326,12 @@ class Database:
         return self.hash_password(password) == stored_password_hash
 
     def close(self):
+        self.writer.close()
+        stats = self.writer_stats()
+        if stats["rows_failed"]:
+            logging.warning(f"Background writer dropped {stats['rows_failed']} of {stats['rows_queued']} rows: {stats}")
+        else:
+            logging.info(f"Background writer: {stats}")
         self.connection.close()
 
 if __name__ == "__main__":
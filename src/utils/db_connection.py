@@ -0,0 +1,35 @@
+# src/utils/db_connection.py
+import os
+import sqlite3
+
+DB_PATH = 'data/engagement_data.db'
+
+# WAL lets the report read while the tracker writes; NORMAL sync is durable across app crashes
+# and only risks the last commits on power loss, without an fsync per transaction.
+PRAGMAS = (
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA cache_size=-16000',  # 16 MB page cache
+    'PRAGMA mmap_size=268435456',  # Map up to 256 MB of the file for reads
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA foreign_keys=ON',
+)
+
+BUSY_TIMEOUT = 10  # seconds to wait for another connection's write lock
+
+
+def connect(db_path=DB_PATH, read_only=False, check_same_thread=True):
+    """Open the engagement database with WAL journaling and tuned pragmas.
+
+    ``read_only`` connections (reports, dashboards) never take the write lock and
+    can run alongside the tracker's writer.
+    """
+    if read_only:
+        connection = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True, timeout=BUSY_TIMEOUT,
+                                     check_same_thread=check_same_thread)
+    else:
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)  # Ensure the directory exists
+        connection = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT, check_same_thread=check_same_thread)
+        connection.execute('PRAGMA journal_mode=WAL')
+    for pragma in PRAGMAS:
+        connection.execute(pragma)
+    return connection
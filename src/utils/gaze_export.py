@@ -0,0 +1,124 @@
+# src/utils/gaze_export.py
+# Columnar export of gaze sessions: Parquet when pyarrow is installed, NumPy .npz otherwise.
+import logging
+import os
+
+import numpy as np
+
+from core.gaze_log import GazeLogReader, session_log_path
+from core.zones import ZONE_CODES, ZONE_NAMES, ZONE_OFF_ROAD, ZONE_ROAD
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# Categories of the zone column; a category's index is its zone code
+ZONE_CATEGORIES = [ZONE_NAMES[code] for code in sorted(ZONE_NAMES)]
+
+
+def export_extension():
+    return '.parquet' if pq is not None else '.npz'
+
+
+def session_gaze_path(session_id, extension=None):
+    return f"data/sessions/session_{session_id}_gaze{extension or export_extension()}"
+
+
+def remove_session_files(session_id):
+    """Delete a session's gaze log and columnar export, in either format; missing files are skipped."""
+    for file_path in (session_log_path(session_id), session_gaze_path(session_id, '.parquet'), session_gaze_path(session_id, '.npz')):
+        try:
+            os.remove(file_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logging.error(f"Could not delete {file_path}: {e}")
+
+
+def export_columns(file_path, columns):
+    """Write typed gaze columns to ``file_path`` (.parquet or .npz).
+
+    ``zone`` holds core.zones codes and is stored as a categorical of zone names;
+    every other column keeps its NumPy dtype.
+    """
+    os.makedirs(os.path.dirname(file_path) or '.', exist_ok=True)
+    if file_path.endswith('.parquet'):
+        if pq is None:
+            raise ImportError("pyarrow is required to write Parquet; export to a .npz path instead")
+        arrays = []
+        for name, values in columns.items():
+            values = np.asarray(values)
+            if name == 'zone':
+                arrays.append(pa.DictionaryArray.from_arrays(pa.array(values.astype(np.int8)), pa.array(ZONE_CATEGORIES)))
+            else:
+                arrays.append(pa.array(values))
+        pq.write_table(pa.table(arrays, names=list(columns)), file_path)
+    else:
+        np.savez(file_path, zone_categories=np.array(ZONE_CATEGORIES), **{name: np.asarray(values) for name, values in columns.items()})
+
+
+def zone_codes(categories, indices):
+    # Remap by name, so files written with a different category order still load correctly
+    lookup = np.array([ZONE_CODES.get(name, ZONE_OFF_ROAD) for name in categories], dtype=np.uint8)
+    return lookup[np.asarray(indices, dtype=np.intp)]
+
+
+def load_columns(file_path, columns=None):
+    """Read ``columns`` (all by default) of an exported session; ``zone`` comes back as codes.
+
+    Only the requested columns are read from disk.
+    """
+    if file_path.endswith('.parquet'):
+        if pq is None:
+            raise ImportError("pyarrow is required to read Parquet")
+        table = pq.read_table(file_path, columns=columns)
+        result = {}
+        for name in table.column_names:
+            chunks = table.column(name).chunks
+            if name == 'zone':
+                result[name] = np.concatenate([zone_codes(chunk.dictionary.to_pylist(), chunk.indices.to_numpy(zero_copy_only=False))
+                                               for chunk in chunks]) if chunks else np.empty(0, dtype=np.uint8)
+            else:
+                result[name] = table.column(name).to_numpy()
+        return result
+
+    # NpzFile reads an array from the archive only when it is accessed
+    with np.load(file_path) as data:
+        names = [name for name in data.files if name != 'zone_categories'] if columns is None else columns
+        result = {}
+        for name in names:
+            if name == 'zone':
+                result[name] = zone_codes(data['zone_categories'].tolist(), data['zone'])
+            else:
+                result[name] = data[name]
+        return result
+
+
+def load_many(file_paths, columns=None):
+    """Concatenate the same columns of several exported sessions."""
+    loaded = [load_columns(file_path, columns) for file_path in file_paths]
+    if not loaded:
+        return {}
+    return {name: np.concatenate([session[name] for session in loaded]) for name in loaded[0]}
+
+
+def load_road_points(file_paths):
+    """``(screen_x, screen_y)`` of the road samples of exported sessions and .gazelog files together, for heatmaps."""
+    xs, ys = [], []
+    exports = [file_path for file_path in file_paths if not file_path.endswith('.gazelog')]
+    if exports:
+        columns = load_many(exports, ['screen_x', 'screen_y', 'zone'])
+        road = columns['zone'] == ZONE_ROAD
+        xs.append(columns['screen_x'][road])
+        ys.append(columns['screen_y'][road])
+    for file_path in file_paths:
+        if file_path.endswith('.gazelog'):
+            screen_x, screen_y = GazeLogReader(file_path).road_points()
+            xs.append(screen_x)
+            ys.append(screen_y)
+    if not xs:
+        return np.empty(0, dtype=np.float32), np.empty(0, dtype=np.float32)
+    return np.concatenate(xs), np.concatenate(ys)
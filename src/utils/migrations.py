@@ -0,0 +1,202 @@
+# src/utils/migrations.py
+import logging
+import sqlite3
+import time
+
+from core.zones import ZONE_NAMES
+
+
+def create_base_tables(connection):
+    # IF NOT EXISTS: databases created before versioning already have these tables
+    connection.execute('''
+        CREATE TABLE IF NOT EXISTS gaze_data (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user TEXT,
+            timestamp TEXT,
+            gaze_direction TEXT
+        )
+    ''')
+    connection.execute('''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE,
+            password_hash TEXT
+        )
+    ''')
+
+
+def add_user_profile_columns(connection):
+    # Older databases may already carry some of these from the previous ALTER TABLE patching
+    columns = [info[1] for info in connection.execute('PRAGMA table_info(users)')]
+    for column in ('first_name', 'last_name', 'email'):
+        if column not in columns:
+            connection.execute(f'ALTER TABLE users ADD COLUMN {column} TEXT')
+
+
+def index_gaze_data(connection):
+    connection.execute('CREATE INDEX IF NOT EXISTS idx_gaze_data_user_timestamp ON gaze_data (user, timestamp)')
+
+
+def create_gaze_samples(connection):
+    # Clustered on (session_id, timestamp): one session is a contiguous range scan and there is no
+    # separate rowid or index to store. timestamp is seconds since the session started.
+    connection.execute('''
+        CREATE TABLE IF NOT EXISTS gaze_samples (
+            session_id INTEGER NOT NULL,
+            timestamp REAL NOT NULL,
+            screen_x REAL,
+            screen_y REAL,
+            zone INTEGER NOT NULL,
+            PRIMARY KEY (session_id, timestamp)
+        ) WITHOUT ROWID
+    ''')
+    connection.execute('''
+        CREATE TABLE IF NOT EXISTS gaze_zones (
+            code INTEGER PRIMARY KEY,
+            name TEXT
+        )
+    ''')
+    connection.executemany('INSERT OR REPLACE INTO gaze_zones (code, name) VALUES (?, ?)', ZONE_NAMES.items())
+
+
+def create_sessions(connection):
+    connection.execute('''
+        CREATE TABLE IF NOT EXISTS calibrations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER REFERENCES users (id) ON DELETE CASCADE,
+            created_at REAL NOT NULL,
+            data TEXT NOT NULL
+        )
+    ''')
+    # started_at/ended_at are Unix times; user_id is NULL only for placeholder sessions created below
+    connection.execute('''
+        CREATE TABLE IF NOT EXISTS sessions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER REFERENCES users (id) ON DELETE CASCADE,
+            started_at REAL,
+            ended_at REAL,
+            camera_index INTEGER,
+            calibration_id INTEGER REFERENCES calibrations (id) ON DELETE SET NULL
+        )
+    ''')
+    connection.execute('CREATE INDEX IF NOT EXISTS idx_sessions_user_started ON sessions (user_id, started_at)')
+    connection.execute('CREATE INDEX IF NOT EXISTS idx_calibrations_user ON calibrations (user_id)')
+
+    # Samples logged before sessions existed keep their session ids as placeholder sessions
+    connection.execute('''
+        INSERT INTO sessions (id)
+        SELECT DISTINCT session_id FROM gaze_samples WHERE session_id NOT IN (SELECT id FROM sessions)
+    ''')
+    # SQLite cannot add a foreign key to an existing table, so gaze_samples is rebuilt with one
+    connection.execute('''
+        CREATE TABLE gaze_samples_new (
+            session_id INTEGER NOT NULL REFERENCES sessions (id) ON DELETE CASCADE,
+            timestamp REAL NOT NULL,
+            screen_x REAL,
+            screen_y REAL,
+            zone INTEGER NOT NULL,
+            PRIMARY KEY (session_id, timestamp)
+        ) WITHOUT ROWID
+    ''')
+    connection.execute('INSERT INTO gaze_samples_new SELECT session_id, timestamp, screen_x, screen_y, zone FROM gaze_samples')
+    connection.execute('DROP TABLE gaze_samples')
+    connection.execute('ALTER TABLE gaze_samples_new RENAME TO gaze_samples')
+
+    # Legacy rows stay keyed by user; new ones also carry their session
+    columns = [info[1] for info in connection.execute('PRAGMA table_info(gaze_data)')]
+    if 'session_id' not in columns:
+        connection.execute('ALTER TABLE gaze_data ADD COLUMN session_id INTEGER REFERENCES sessions (id) ON DELETE CASCADE')
+    connection.execute('CREATE INDEX IF NOT EXISTS idx_gaze_data_session ON gaze_data (session_id)')
+
+
+def allow_duplicate_sample_timestamps(connection):
+    # The (session_id, timestamp) primary key kept one sample per frame: INSERT OR REPLACE overwrote
+    # every other face detected in the same frame. A rowid table keeps them all in insertion order,
+    # and the index still makes reading one session a range scan.
+    connection.execute('''
+        CREATE TABLE gaze_samples_new (
+            id INTEGER PRIMARY KEY,
+            session_id INTEGER NOT NULL REFERENCES sessions (id) ON DELETE CASCADE,
+            timestamp REAL NOT NULL,
+            screen_x REAL,
+            screen_y REAL,
+            zone INTEGER NOT NULL
+        )
+    ''')
+    connection.execute('''
+        INSERT INTO gaze_samples_new (session_id, timestamp, screen_x, screen_y, zone)
+        SELECT session_id, timestamp, screen_x, screen_y, zone FROM gaze_samples
+    ''')
+    connection.execute('DROP TABLE gaze_samples')
+    connection.execute('ALTER TABLE gaze_samples_new RENAME TO gaze_samples')
+    connection.execute('CREATE INDEX idx_gaze_samples_session_timestamp ON gaze_samples (session_id, timestamp)')
+
+
+def create_report_tokens(connection):
+    # The report server is a separate process; the app hands it a random token per report link
+    # instead of a username the browser could change
+    connection.execute('''
+        CREATE TABLE IF NOT EXISTS report_tokens (
+            token TEXT PRIMARY KEY,
+            user_id INTEGER NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+            created_at REAL NOT NULL
+        )
+    ''')
+    connection.execute('CREATE INDEX IF NOT EXISTS idx_report_tokens_user ON report_tokens (user_id)')
+
+
+# (version, description, function); append new migrations, never edit or reorder applied ones
+MIGRATIONS = [
+    (1, 'gaze_data and users tables', create_base_tables),
+    (2, 'users profile columns', add_user_profile_columns),
+    (3, 'gaze_data (user, timestamp) index', index_gaze_data),
+    (4, 'typed gaze_samples table and gaze_zones codes', create_gaze_samples),
+    (5, 'sessions and calibrations tables, samples linked to sessions', create_sessions),
+    (6, 'gaze_samples keeps samples sharing a timestamp', allow_duplicate_sample_timestamps),
+    (7, 'report_tokens table', create_report_tokens),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def schema_version(connection):
+    try:
+        return connection.execute('SELECT MAX(version) FROM schema_version').fetchone()[0] or 0
+    except sqlite3.OperationalError:
+        # No schema_version table yet
+        return 0
+
+
+def migrate(connection):
+    """Bring the database up to ``LATEST_VERSION``, applying each pending migration once.
+
+    An up-to-date database costs a single ``SELECT MAX(version)``.
+    """
+    if schema_version(connection) >= LATEST_VERSION:
+        return LATEST_VERSION
+
+    connection.commit()
+    # BEGIN IMMEDIATE takes the write lock, so a second connection migrating at the same
+    # time waits here and then sees the versions this one recorded
+    connection.execute('BEGIN IMMEDIATE')
+    try:
+        connection.execute('''
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                description TEXT,
+                applied_at TEXT
+            )
+        ''')
+        version = schema_version(connection)
+        for migration_version, description, function in MIGRATIONS:
+            if migration_version <= version:
+                continue
+            logging.info(f"Applying schema migration {migration_version}: {description}")
+            function(connection)
+            connection.execute('INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)',
+                               (migration_version, description, time.strftime('%Y-%m-%d %H:%M:%S')))
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    return LATEST_VERSION
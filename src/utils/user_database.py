@@ -1,36 +1,29 @@
 # src/utils/user_database.py
 import sqlite3
 import hashlib
-import os
+import secrets
+import time
+from utils.db_connection import DB_PATH, connect
+from utils.gaze_export import remove_session_files
+from utils.migrations import migrate
+
+REPORT_TOKEN_TTL = 12 * 3600  # seconds a report link stays valid if the app does not revoke it first
+
+def report_token_user(connection, token, max_age=REPORT_TOKEN_TTL):
+    """Username a report token was issued to, or None if it is unknown or expired; works read-only."""
+    row = connection.execute('''
+        SELECT users.username FROM report_tokens JOIN users ON users.id = report_tokens.user_id
+        WHERE report_tokens.token = ? AND report_tokens.created_at >= ?
+    ''', (token, time.time() - max_age)).fetchone()
+    return row[0] if row else None
 
 class UserDatabase:
-    def __init__(self):
-        db_path = 'data/engagement_data.db'
-        os.makedirs(os.path.dirname(db_path), exist_ok=True)  # Ensure the directory exists
-        self.connection = sqlite3.connect(db_path)
+    def __init__(self, db_path=DB_PATH):
+        self.connection = connect(db_path)
         self.create_tables()
 
     def create_tables(self):
-        cursor = self.connection.cursor()
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE,
-                password_hash TEXT
-            )
-        ''')
-
-        cursor.execute('PRAGMA table_info(users)')
-        columns = [info[1] for info in cursor.fetchall()]
-        
-        if 'first_name' not in columns:
-            cursor.execute('ALTER TABLE users ADD COLUMN first_name TEXT')
-        if 'last_name' not in columns:
-            cursor.execute('ALTER TABLE users ADD COLUMN last_name TEXT')
-        if 'email' not in columns:
-            cursor.execute('ALTER TABLE users ADD COLUMN email TEXT')
-
-        self.connection.commit()
+        migrate(self.connection)
 
     def create_user(self, username, password, first_name, last_name, email):
         cursor = self.connection.cursor()
@@ -64,11 +57,38 @@ class UserDatabase:
         return cursor.fetchone()
 
     def delete_user(self, username):
-        cursor = self.connection.cursor()
-        cursor.execute('''
-            DELETE FROM users WHERE username = ?
-        ''', (username,))
-        self.connection.commit()
+        # Sessions, their gaze samples and calibrations are removed by ON DELETE CASCADE;
+        # gaze_data rows logged before sessions existed are only keyed by the username
+        with self.connection:
+            session_ids = [row[0] for row in self.connection.execute('''
+                SELECT sessions.id FROM sessions JOIN users ON users.id = sessions.user_id WHERE users.username = ?
+            ''', (username,))]
+            self.connection.execute('''
+                DELETE FROM gaze_data WHERE user = ?
+            ''', (username,))
+            self.connection.execute('''
+                DELETE FROM users WHERE username = ?
+            ''', (username,))
+        # The sessions' gaze logs and exports go once their rows are gone
+        for session_id in session_ids:
+            remove_session_files(session_id)
+
+    def create_report_token(self, username):
+        token = secrets.token_urlsafe(32)
+        with self.connection:
+            self.connection.execute('''
+                INSERT INTO report_tokens (token, user_id, created_at)
+                SELECT ?, id, ? FROM users WHERE username = ?
+            ''', (token, time.time(), username))
+        return token
+
+    def revoke_report_tokens(self, username):
+        # Expired tokens of every user go too, so the table does not grow
+        with self.connection:
+            self.connection.execute('''
+                DELETE FROM report_tokens
+                WHERE user_id IN (SELECT id FROM users WHERE username = ?) OR created_at < ?
+            ''', (username, time.time() - REPORT_TOKEN_TTL))
 
     def hash_password(self, password):
         return hashlib.sha256(password.encode()).hexdigest()